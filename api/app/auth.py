@@ -1,7 +1,7 @@
 import os, datetime
 from jose import jwt
 from sqlalchemy import text
-from database import SessionLocal
+from database import SessionLocal, ReadSession
 
 JWT_SECRET = os.environ.get("JWT_SECRET", "change-me")
 JWT_EXPIRE_MINUTES = int(os.environ.get("JWT_EXPIRE_MINUTES", 120))
@@ -24,12 +24,14 @@ def login_and_get_user(email: str, password: str):
       return None
     return row.id
 
-def memberships_for_user(user_id: str):
-  with SessionLocal() as db:
-    rows = db.execute(text("""
-      SELECT a.id::text, a.name
-      FROM memberships m JOIN accounts a ON a.id = m.account_id
-      WHERE m.user_id = :u
-      ORDER BY a.created_at DESC
-    """), {"u": user_id}).all()
-    return [{"id": r[0], "name": r[1]} for r in rows]
+def memberships_for_user(user_id: str, db=None):
+  if db is None:
+    with ReadSession() as db:
+      return memberships_for_user(user_id, db)
+  rows = db.execute(text("""
+    SELECT a.id::text, a.name
+    FROM memberships m JOIN accounts a ON a.id = m.account_id
+    WHERE m.user_id = :u
+    ORDER BY a.created_at DESC
+  """), {"u": user_id}).all()
+  return [{"id": r[0], "name": r[1]} for r in rows]
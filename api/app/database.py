@@ -1,7 +1,151 @@
-import os
-from sqlalchemy import create_engine
+import logging, os, contextvars, itertools, threading, time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
 from sqlalchemy.orm import sessionmaker
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Optional comma separated read replicas; GET requests read from these when caught up
+REPLICA_DATABASE_URLS = [u.strip() for u in os.environ.get("REPLICA_DATABASE_URLS", "").split(",") if u.strip()]
+# psycopg prepares a statement server-side once it has run this many times on a connection
+DB_PREPARE_THRESHOLD = int(os.environ.get("DB_PREPARE_THRESHOLD", 5))
+# Connections kept open per engine, and how many more may be opened under load
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+# Seconds to wait for a new connection, so an unreachable DB fails fast instead of hanging
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+
+def _create_engine(url: str):
+  return create_engine(
+    url,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    connect_args={"prepare_threshold": DB_PREPARE_THRESHOLD, "connect_timeout": DB_CONNECT_TIMEOUT},
+  )
+
+engine = _create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+replica_engines = [_create_engine(url) for url in REPLICA_DATABASE_URLS]
+ReplicaSessions = [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in replica_engines]
+_replica_turn = itertools.count()
+# Replicas further behind than this are skipped even without X-Min-LSN
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 30))
+# A replica that failed its probe is not tried again for this long
+REPLICA_RETRY_SECONDS = float(os.environ.get("REPLICA_RETRY_SECONDS", 10))
+_replica_down_until = [0.0] * len(replica_engines)
+
+# One probe per read: the replica answers, is within REPLICA_MAX_LAG_SECONDS
+# (or has replayed all it received, i.e. the primary is just idle) and, when
+# the client sent X-Min-LSN, has replayed that write.
+_REPLICA_PROBE = text("""
+  SELECT
+    (CAST(:lsn AS pg_lsn) IS NULL OR COALESCE(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), false))
+    AND (
+      pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+      OR COALESCE(now() - pg_last_xact_replay_timestamp() <= make_interval(secs => :lag), false)
+    )
+""")
+
+# Per-request routing state, installed by the middleware in main.py:
+# {"use_replica": bool, "min_lsn": str | None, "write_lsn": str | None}
+request_routing: contextvars.ContextVar[dict | None] = contextvars.ContextVar("request_routing", default=None)
+
+def ReadSession():
+  """Session for read-only queries.
+
+  Returns a replica session when the request allows it and the replica is
+  up, not lagging by more than REPLICA_MAX_LAG_SECONDS and has replayed at
+  least the caller's last write (its X-Min-LSN). Otherwise, or when no
+  replica qualifies, falls back to the primary.
+  """
+  state = request_routing.get()
+  if not ReplicaSessions or not state or not state.get("use_replica"):
+    return SessionLocal()
+  min_lsn = state.get("min_lsn")
+  start = next(_replica_turn)
+  for i in range(len(ReplicaSessions)):
+    idx = (start + i) % len(ReplicaSessions)
+    if _replica_down_until[idx] > time.monotonic():
+      continue
+    db = ReplicaSessions[idx]()
+    try:
+      usable = db.execute(_REPLICA_PROBE, {"lsn": min_lsn, "lag": REPLICA_MAX_LAG_SECONDS}).scalar()
+    except Exception:
+      logger.warning("Read replica %d unavailable; reading from the primary", idx, exc_info=True)
+      _replica_down_until[idx] = time.monotonic() + REPLICA_RETRY_SECONDS
+      usable = False
+    if usable:
+      return db
+    db.close()
+  return SessionLocal()
+
+def record_write(db, states: list[dict | None] | None = None):
+  """Remember the primary WAL position after a commit for read-your-writes.
+
+  The middleware returns it as X-Session-LSN; clients echo it back as
+  X-Min-LSN so later reads skip replicas that have not replayed it yet.
+  `states` lets a shared commit (ingest.py) report to several requests.
+  """
+  if states is None:
+    states = [request_routing.get()]
+  states = [s for s in states if s is not None]
+  if not ReplicaSessions or not states:
+    return
+  lsn = db.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+  for state in states:
+    state["write_lsn"] = lsn
+
+# statement_timeout (ms) applied by rls.set_current_account; None keeps the
+# server default. Routes set it through deps.statement_timeout().
+statement_timeout_ms: contextvars.ContextVar[int | None] = contextvars.ContextVar("statement_timeout_ms", default=None)
+
+class QueryCancelled(Exception):
+  pass
+
+class CancelScope:
+  """DB connections currently used by one request, so its queries can be
+  cancelled when the client disconnects (see deps.run_cancellable)."""
+
+  def __init__(self):
+    self.cancelled = False
+    self._connections = set()
+    self._lock = threading.Lock()
+
+  def add(self, dbapi_connection):
+    with self._lock:
+      if self.cancelled:
+        raise QueryCancelled()
+      self._connections.add(dbapi_connection)
+
+  def discard(self, dbapi_connection):
+    with self._lock:
+      self._connections.discard(dbapi_connection)
+
+  def cancel(self):
+    # Holding the lock keeps a connection from being checked in (and reused
+    # by another request) while its cancel request is in flight.
+    with self._lock:
+      self.cancelled = True
+      for conn in self._connections:
+        try:
+          conn.cancel()
+        except Exception:
+          pass
+
+cancel_scope: contextvars.ContextVar[CancelScope | None] = contextvars.ContextVar("cancel_scope", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _track_connection(conn, cursor, statement, parameters, context, executemany):
+  scope = cancel_scope.get()
+  if scope is not None:
+    scope.add(conn.connection.dbapi_connection)
+
+@event.listens_for(Pool, "checkin")
+def _untrack_connection(dbapi_connection, connection_record):
+  scope = cancel_scope.get()
+  if scope is not None and dbapi_connection is not None:
+    scope.discard(dbapi_connection)
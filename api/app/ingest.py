@@ -0,0 +1,153 @@
+"""Write coalescing for item and comment creation.
+
+With INGEST_MODE=buffered, create requests are queued for up to
+INGEST_FLUSH_MS (or until INGEST_MAX_BATCH rows are waiting) and written
+together: one multi-row INSERT per tenant and table, all in one transaction,
+so concurrent writers share a single commit (group commit). Ids are generated
+here, and each caller is answered with its own row only after the commit, so
+an acknowledged write is never lost. If the batch fails, its rows are retried
+one by one under savepoints and only the failing rows see an error.
+
+The default mode (direct) writes each request on its own, as before.
+"""
+import asyncio, logging, os, uuid
+from collections import defaultdict
+from fastapi import HTTPException
+from sqlalchemy import text
+from database import SessionLocal, record_write, request_routing
+import rls
+
+logger = logging.getLogger(__name__)
+
+INGEST_MODE = os.environ.get("INGEST_MODE", "direct").strip().lower()
+INGEST_FLUSH_MS = float(os.environ.get("INGEST_FLUSH_MS", 5))
+INGEST_MAX_BATCH = int(os.environ.get("INGEST_MAX_BATCH", 500))
+
+_INSERTS = {"item": rls.insert_items, "comment": rls.insert_comments}
+
+_pending: list[dict] = []
+_flush_handle: asyncio.TimerHandle | None = None
+_flushing: set[asyncio.Task] = set()
+
+def _user_names(db, user_ids: list[str]) -> dict[str, str]:
+  rows = db.execute(
+    text("SELECT id::text, COALESCE(name, email) FROM users WHERE id = ANY(CAST(:ids AS uuid[]))"),
+    {"ids": list(set(user_ids))},
+  ).all()
+  return {r[0]: r[1] for r in rows}
+
+def _user_not_found():
+  return HTTPException(status_code=403, detail="User not found")
+
+async def create_item(account_id: str, section: str, name: str, data: dict) -> dict:
+  if INGEST_MODE != "buffered":
+    return rls.create_item(account_id, section=section, name=name, data=data)
+  row = {"id": str(uuid.uuid4()), "section": section, "name": name, "data": data}
+  return await _submit("item", account_id, row)
+
+async def create_comment(account_id: str, item_id: str, user_id: str, user_name: str | None, comment: str) -> dict:
+  """Create a comment by an existing user; `user_name` defaults to their name or email."""
+  if INGEST_MODE != "buffered":
+    with SessionLocal() as db:
+      names = _user_names(db, [user_id])
+    if user_id not in names:
+      raise _user_not_found()
+    return rls.create_comment(account_id, item_id, user_id, user_name or names[user_id], comment)
+  row = {"id": str(uuid.uuid4()), "item_id": item_id, "user_id": user_id, "user_name": user_name, "comment": comment}
+  return await _submit("comment", account_id, row)
+
+async def _submit(kind: str, account_id: str, row: dict) -> dict:
+  global _flush_handle
+  loop = asyncio.get_running_loop()
+  future = loop.create_future()
+  _pending.append({
+    "kind": kind,
+    "account_id": account_id,
+    "row": row,
+    "future": future,
+    "routing": request_routing.get(),
+  })
+  if len(_pending) >= INGEST_MAX_BATCH:
+    _flush()
+  elif _flush_handle is None:
+    _flush_handle = loop.call_later(INGEST_FLUSH_MS / 1000, _flush)
+  return await future
+
+def _flush():
+  global _pending, _flush_handle
+  if _flush_handle is not None:
+    _flush_handle.cancel()
+    _flush_handle = None
+  if not _pending:
+    return
+  batch, _pending = _pending, []
+  task = asyncio.get_running_loop().create_task(_write(batch))
+  _flushing.add(task)
+  task.add_done_callback(_flushing.discard)
+
+async def _write(batch: list[dict]):
+  try:
+    results = await asyncio.to_thread(_write_batch, batch)
+  except Exception as e:
+    results = [e] * len(batch)
+  for entry, result in zip(batch, results):
+    if entry["future"].done():
+      continue
+    if isinstance(result, BaseException):
+      entry["future"].set_exception(result)
+    else:
+      entry["future"].set_result(result)
+
+def _write_batch(batch: list[dict]) -> list:
+  """Write a batch in one transaction; returns a row or an exception per entry."""
+  results: list = [None] * len(batch)
+  with SessionLocal() as db:
+    # Every commenter must exist; the lookup also fills in missing names.
+    user_ids = [e["row"]["user_id"] for e in batch if e["kind"] == "comment"]
+    if user_ids:
+      names = _user_names(db, user_ids)
+      for i, entry in enumerate(batch):
+        row = entry["row"]
+        if entry["kind"] != "comment":
+          continue
+        if row["user_id"] not in names:
+          results[i] = _user_not_found()
+        elif not row["user_name"]:
+          row["user_name"] = names[row["user_id"]]
+
+    groups: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for i, entry in enumerate(batch):
+      if results[i] is None:
+        groups[(entry["account_id"], entry["kind"])].append(i)
+    # A fixed order (by tenant, items before comments) keeps concurrent
+    # batches from locking the same tables in opposite orders.
+    order = sorted(groups, key=lambda g: (g[0], g[1] != "item"))
+
+    try:
+      for account_id, kind in order:
+        idx = groups[(account_id, kind)]
+        rows = _INSERTS[kind](db, account_id, [batch[i]["row"] for i in idx])
+        for i, row in zip(idx, rows):
+          results[i] = row
+    except Exception:
+      logger.warning("Batched insert of %d rows failed; retrying row by row", len(batch), exc_info=True)
+      db.rollback()
+      for account_id, kind in order:
+        for i in groups[(account_id, kind)]:
+          try:
+            with db.begin_nested():
+              results[i] = _INSERTS[kind](db, account_id, [batch[i]["row"]])[0]
+          except Exception as e:
+            results[i] = e
+
+    written = [i for i, r in enumerate(results) if isinstance(r, dict)]
+    if written:
+      db.commit()
+      record_write(db, [batch[i]["routing"] for i in written])
+  return results
+
+async def drain():
+  """Flush queued writes and wait for in-flight batches (on shutdown)."""
+  _flush()
+  while _flushing:
+    await asyncio.gather(*list(_flushing), return_exceptions=True)
@@ -1,7 +1,10 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from contextlib import asynccontextmanager
 from typing import Optional
-import json
+import asyncio, json, math, os, re, uuid
 from schemas import (
     LoginRequest,
     Token,
@@ -12,6 +15,9 @@ from schemas import (
     ItemCreate,
     ItemOut,
     ItemsPage,
+    SearchPage,
+    AggregateRequest,
+    AggregateOut,
     AdminUser,
     CreateAdmin,
     AdminUserUpdate,
@@ -23,12 +29,28 @@ from schemas import (
     CommentCreate,
     CommentOut,
     ItemUpdate,
+    BootstrapOut,
+    AdmissionStats,
 )
 from auth import login_and_get_user, create_token, memberships_for_user
-from deps import current_user, ip_allowlist, require_admin
+from deps import current_user, ip_allowlist, require_admin, statement_timeout, run_cancellable
+from ratelimit import account_admission, snapshot as admission_snapshot
 import rls
+import ingest
+import warmup
 from sqlalchemy import text
-from database import SessionLocal
+from database import SessionLocal, ReadSession, record_write, request_routing
+
+GZIP_MIN_SIZE = int(os.environ.get("GZIP_MIN_SIZE", 1024))
+LSN_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+NUMBER_PATTERN = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+# statement_timeout for interactive reads and for heavier report queries
+READ_TIMEOUT_MS = int(os.environ.get("READ_TIMEOUT_MS", 5000))
+REPORT_TIMEOUT_MS = int(os.environ.get("REPORT_TIMEOUT_MS", 20000))
+# Partition new accounts' items by "section" or "month" (db/init/008_item_partitioning.sql)
+ITEM_PARTITIONING = os.environ.get("ITEM_PARTITIONING", "").strip().lower()
+if ITEM_PARTITIONING not in ("", "section", "month"):
+  raise RuntimeError(f"ITEM_PARTITIONING must be section, month or empty, not {ITEM_PARTITIONING!r}")
 
 DEFAULT_PREFERENCES: dict[str, str | bool] = {
   "accounts_label": "Home",
@@ -61,6 +83,7 @@ def save_preferences(db, user_id: str, labels: dict) -> dict:
     ON CONFLICT (user_id) DO UPDATE SET ui_labels = EXCLUDED.ui_labels
   """), {"u": user_id, "l": json.dumps(merged)})
   db.commit()
+  record_write(db)
   return merged
 
 def normalize_section_schema(raw: dict | None) -> dict:
@@ -96,18 +119,142 @@ def normalize_section_schema(raw: dict | None) -> dict:
       field["options"] = val["options"]
     if "order" in val:
       field["order"] = val["order"]
+    for flag in ("indexed", "sortable"):
+      if flag in val:
+        field[flag] = bool(val[flag])
     normalized_fields.append(field)
 
   return {"fields": normalized_fields}
 
-app = FastAPI(title="Multi-tenant JSON API")
+def coerce_filter_value(key: str, value, sql_type: str) -> str | None:
+  """Validate one aggregate filter value against its field type; returns the SQL text form."""
+  if value is None:
+    return None
+  if isinstance(value, (dict, list)):
+    raise HTTPException(status_code=400, detail=f"Filter on {key!r} must be a scalar value")
+  if sql_type == "boolean":
+    if isinstance(value, bool):
+      return "true" if value else "false"
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+      return value.strip().lower()
+    raise HTTPException(status_code=400, detail=f"Filter on checkbox field {key!r} must be true or false")
+  if sql_type == "numeric":
+    text_value = str(value).strip()
+    if isinstance(value, bool) or not NUMBER_PATTERN.match(text_value) or not math.isfinite(float(text_value)):
+      raise HTTPException(status_code=400, detail=f"Filter on number field {key!r} must be a number")
+    return text_value
+  if isinstance(value, bool):
+    return "true" if value else "false"
+  return str(value)
+
+def parse_cursor_param(raw: str | None) -> str | None:
+  """Reject a malformed items `cursor=` up front (400 rather than a failed query)."""
+  if raw:
+    try:
+      rls.parse_item_cursor(raw)
+    except ValueError:
+      raise HTTPException(status_code=400, detail="Invalid cursor")
+  return raw or None
+
+def item_sort(sort: str | None, direction: str | None, section: SectionOut | None) -> tuple[str, str | None, str] | None:
+  """Validate `sort=` / `dir=` for item pages into rls' (key, field type, direction).
+
+  `sort` is created_at, name or a data key; data keys are typed by the
+  section schema so the sort matches the field's sortable index.
+  """
+  if direction not in (None, "asc", "desc"):
+    raise HTTPException(status_code=400, detail="dir must be asc or desc")
+  if not sort:
+    return None
+  if len(sort) > 200:
+    raise HTTPException(status_code=400, detail="Invalid sort key")
+  fields = section.schema.get("fields", []) if section else []
+  field_type = next((f.get("type") for f in fields if f.get("key") == sort), None)
+  return sort, field_type, direction or ("desc" if sort == "created_at" else "asc")
+
+def load_item_sort(account_id: str, slug: str, sort: str | None, direction: str | None):
+  """item_sort for the list endpoints; only data keys need the section schema."""
+  section = None
+  if sort and sort not in ("created_at", "name"):
+    with ReadSession() as db:
+      section = fetch_section(db, account_id, slug)
+  return item_sort(sort, direction, section)
+
+def parse_fields_param(raw: str | None) -> list[str] | None:
+  """Split a comma separated `fields=` query value into data keys."""
+  if raw is None:
+    return None
+  fields = [f.strip() for f in raw.split(",") if f.strip()]
+  return list(dict.fromkeys(fields))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  # Open pooled connections and warm caches in the background (warmup.py);
+  # /healthz answers at once, /readyz reports 503 until the warm-up is done.
+  warmup.start()
+  yield
+  # Buffered ingestion (ingest.py) may still hold queued writes.
+  await ingest.drain()
+
+app = FastAPI(title="Multi-tenant JSON API", lifespan=lifespan)
 app.add_middleware(
   CORSMiddleware,
   allow_origins=["*"],
   allow_credentials=True,
   allow_methods=["*"],
-  allow_headers=["*"]
+  allow_headers=["*"],
+  expose_headers=["X-Session-LSN", "Retry-After"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
+class RouteReads:
+  """Let GET requests read from replicas, honouring the client's X-Min-LSN.
+
+  Writes record the primary's WAL position (database.record_write), which
+  is returned as X-Session-LSN for the client to send back on later reads.
+  Plain ASGI rather than @app.middleware("http"), so the endpoint keeps the
+  real receive channel and request.is_disconnected() still sees the client
+  go away (deps.run_cancellable relies on it).
+  """
+  def __init__(self, app):
+    self.app = app
+
+  async def __call__(self, scope, receive, send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+    min_lsn = Headers(scope=scope).get("x-min-lsn")
+    state = {
+      "use_replica": scope["method"] in ("GET", "HEAD"),
+      "min_lsn": min_lsn if min_lsn and LSN_PATTERN.match(min_lsn) else None,
+      "write_lsn": None,
+    }
+
+    async def send_with_lsn(message):
+      if message["type"] == "http.response.start" and state["write_lsn"]:
+        MutableHeaders(scope=message)["X-Session-LSN"] = state["write_lsn"]
+      await send(message)
+
+    token = request_routing.set(state)
+    try:
+      await self.app(scope, receive, send_with_lsn)
+    finally:
+      request_routing.reset(token)
+
+app.add_middleware(RouteReads)
+
+@app.get("/healthz")
+def healthz():
+  """Liveness: the process is up and serving requests."""
+  return {"ok": True}
+
+@app.get("/readyz")
+async def readyz():
+  """Readiness: warm-up has finished and the database answers."""
+  ready, body = await asyncio.to_thread(warmup.check_ready)
+  if not ready:
+    raise HTTPException(status_code=503, detail=body)
+  return body
 
 @app.post("/api/login", response_model=Token, dependencies=[Depends(ip_allowlist)])
 async def login(payload: LoginRequest):
@@ -116,24 +263,45 @@ async def login(payload: LoginRequest):
     raise HTTPException(status_code=401, detail="Invalid credentials")
   return Token(access_token=create_token(uid))
 
+def load_me(db, user_id: str) -> MeOut:
+  row = db.execute(text("""
+    SELECT id::text,
+           email,
+           COALESCE(name, ''),
+           COALESCE(user_type, CASE WHEN is_admin THEN 'admin' ELSE 'standard' END),
+           is_admin
+    FROM users
+    WHERE id=:u
+  """), {"u": user_id}).first()
+  if not row:
+    raise HTTPException(status_code=404, detail="User not found")
+  prefs = get_preferences(db, user_id)
+  user_type = row[3] or ("admin" if row[4] else "standard")
+  is_admin_flag = user_type in ("admin", "super_admin") or bool(row[4])
+  return MeOut(id=row[0], email=row[1], name=row[2], user_type=user_type, is_admin=is_admin_flag, preferences=Preferences(**prefs))
+
+def fetch_section(db, account_id: str, slug: str) -> SectionOut | None:
+  row = db.execute(text("""
+    SELECT id::text, slug, label, COALESCE(schema, '{}'::jsonb)
+    FROM sections
+    WHERE account_id = :a AND slug = :s
+    LIMIT 1
+  """), {"a": account_id, "s": slug}).first()
+  if not row:
+    return None
+  return SectionOut(id=row[0], slug=row[1], label=row[2], schema=normalize_section_schema(row[3]))
+
+def table_fields(section: SectionOut | None) -> list[str] | None:
+  """Data keys the section table shows, mirroring projectedFields() in section.js."""
+  if not section:
+    return None
+  fields = [f["key"] for f in section.schema.get("fields", []) if f.get("showInTable", True) is not False]
+  return fields or None
+
 @app.get("/api/me", response_model=MeOut, dependencies=[Depends(ip_allowlist)])
 async def me(user_id: str = Depends(current_user)):
   with SessionLocal() as db:
-    row = db.execute(text("""
-      SELECT id::text,
-             email,
-             COALESCE(name, ''),
-             COALESCE(user_type, CASE WHEN is_admin THEN 'admin' ELSE 'standard' END),
-             is_admin
-      FROM users
-      WHERE id=:u
-    """), {"u": user_id}).first()
-    if not row:
-      raise HTTPException(status_code=404, detail="User not found")
-    prefs = get_preferences(db, user_id)
-    user_type = row[3] or ("admin" if row[4] else "standard")
-    is_admin_flag = user_type in ("admin", "super_admin") or bool(row[4])
-    return MeOut(id=row[0], email=row[1], name=row[2], user_type=user_type, is_admin=is_admin_flag, preferences=Preferences(**prefs))
+    return load_me(db, user_id)
 
 @app.get("/api/me/preferences", response_model=Preferences, dependencies=[Depends(ip_allowlist)])
 async def read_preferences(user_id: str = Depends(current_user)):
@@ -165,6 +333,56 @@ async def update_preferences(body: PreferencesUpdate, user_id: str = Depends(cur
 async def my_accounts(user_id: str = Depends(current_user)):
   return memberships_for_user(user_id)
 
+def load_bootstrap(user_id: str, account: str | None, section: str | None, item: str | None, limit: int, fields: str | None, sort: str | None = None, direction: str | None = None, comments: bool = False) -> BootstrapOut:
+  with ReadSession() as db:
+    out = BootstrapOut(me=load_me(db, user_id), accounts=memberships_for_user(user_id, db))
+    if not account:
+      return out
+    if section:
+      out.section = fetch_section(db, account, section)
+      if not out.section:
+        raise HTTPException(status_code=404, detail="Section not found")
+    if section and limit:
+      projection = parse_fields_param(fields) if fields is not None else table_fields(out.section)
+      page = rls.list_items(account, section=section, limit=limit, fields=projection, sort=item_sort(sort, direction, out.section), db=db)
+      out.items = ItemsPage(items=[ItemOut(**r) for r in page["items"]], next=page["next"])
+    if item:
+      found = rls.get_item(account, item, db=db)
+      if not found:
+        raise HTTPException(status_code=404, detail="Item not found")
+      out.item = ItemOut(id=found["id"], name=found["name"], data=found["data"], created_at=found["created_at"])
+      if comments:
+        out.comments = rls.list_comments(account, item, db=db)
+    return out
+
+@app.get("/api/bootstrap", response_model=BootstrapOut, dependencies=[Depends(ip_allowlist), Depends(account_admission), Depends(statement_timeout(READ_TIMEOUT_MS))])
+async def bootstrap(
+  request: Request,
+  account: Optional[str] = None,
+  section: Optional[str] = None,
+  item: Optional[str] = None,
+  limit: int = Query(50, ge=0, le=200, description="Items page size; 0 skips the items page"),
+  fields: Optional[str] = Query(None, description="Comma separated data keys; defaults to the section's table columns"),
+  sort: Optional[str] = Query(None, description="Items page order: created_at (default), name or a data key"),
+  dir: Optional[str] = Query(None, description="asc or desc"),
+  comments: bool = Query(False, description="Also return the item's comments"),
+  user_id: str = Depends(current_user),
+):
+  """Everything a page needs on first load, read in one session.
+
+  Always returns the user and their accounts. With `account` and `section`
+  it adds the section schema and (unless limit=0) the first page of items,
+  in `sort`/`dir` order;
+  with `account` and `item` it adds the item, and its comments if asked for.
+  An unknown section or item is a 404, a malformed item id a 400.
+  """
+  if item:
+    try:
+      item = str(uuid.UUID(item))
+    except ValueError:
+      raise HTTPException(status_code=400, detail="Invalid item id")
+  return await run_cancellable(request, load_bootstrap, user_id, account, section, item, limit, fields, sort, dir, comments)
+
 @app.post("/api/accounts", response_model=AccountOut, status_code=201, dependencies=[Depends(ip_allowlist)])
 async def create_account(body: AccountCreate, user_id: str = Depends(current_user)):
   name = body.name.strip()
@@ -191,6 +409,7 @@ async def create_account(body: AccountCreate, user_id: str = Depends(current_use
       {"u": user_id, "a": account_id}
     )
 
+    partition_sql = f"PERFORM partition_tenant_items(sch, '{ITEM_PARTITIONING}');" if ITEM_PARTITIONING else ""
     schema_sql = f"""
       DO $$
       DECLARE sch text := '{schema_name}';
@@ -235,15 +454,19 @@ async def create_account(body: AccountCreate, user_id: str = Depends(current_use
           EXECUTE format('CREATE POLICY comments_tenant_policy ON %I.comments USING (true)', sch);
         END IF;
 
+        PERFORM ensure_item_search(sch);
+        PERFORM ensure_item_page_index(sch);
+        {partition_sql}
       END $$;
     """
     db.execute(text(schema_sql))
     db.commit()
+    record_write(db)
     return AccountOut(id=row[0], name=row[1])
 
 # --- Account management ---
 
-@app.put("/api/accounts/{account_id}", response_model=AccountOut, dependencies=[Depends(ip_allowlist)])
+@app.put("/api/accounts/{account_id}", response_model=AccountOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def update_account(account_id: str, body: AccountUpdate, user_id: str = Depends(current_user)):
   with SessionLocal() as db:
     row = db.execute(
@@ -253,9 +476,10 @@ async def update_account(account_id: str, body: AccountUpdate, user_id: str = De
     if not row:
       raise HTTPException(status_code=404, detail="Account not found")
     db.commit()
+    record_write(db)
     return AccountOut(id=row[0], name=row[1])
 
-@app.delete("/api/accounts/{account_id}", dependencies=[Depends(ip_allowlist)])
+@app.delete("/api/accounts/{account_id}", dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def delete_account(account_id: str, user_id: str = Depends(current_user)):
   schema_name = f"tenant_{account_id.replace('-', '')}"
   with SessionLocal() as db:
@@ -264,15 +488,16 @@ async def delete_account(account_id: str, user_id: str = Depends(current_user)):
     db.execute(text("DELETE FROM sections WHERE account_id=:a"), {"a": account_id})
     result = db.execute(text("DELETE FROM accounts WHERE id=:a"), {"a": account_id})
     db.commit()
+    record_write(db)
     if result.rowcount == 0:
       raise HTTPException(status_code=404, detail="Account not found")
   return {"ok": True}
 
 # --- Sections API ---
 
-@app.get("/api/accounts/{account_id}/sections", response_model=list[SectionOut], dependencies=[Depends(ip_allowlist)])
+@app.get("/api/accounts/{account_id}/sections", response_model=list[SectionOut], dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def list_sections(account_id: str, user_id: str = Depends(current_user)):
-  with SessionLocal() as db:
+  with ReadSession() as db:
     rows = db.execute(text("""
       SELECT id::text, slug, label, COALESCE(schema, '{}'::jsonb)
       FROM sections
@@ -281,8 +506,8 @@ async def list_sections(account_id: str, user_id: str = Depends(current_user)):
     """), {"a": account_id}).all()
     return [SectionOut(id=r[0], slug=r[1], label=r[2], schema=normalize_section_schema(r[3])) for r in rows]
 
-@app.post("/api/accounts/{account_id}/sections", response_model=SectionOut, dependencies=[Depends(ip_allowlist)])
-async def create_section(account_id: str, body: SectionCreate, user_id: str = Depends(current_user)):
+@app.post("/api/accounts/{account_id}/sections", response_model=SectionOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
+async def create_section(account_id: str, body: SectionCreate, background_tasks: BackgroundTasks, user_id: str = Depends(current_user)):
   payload = json.dumps(normalize_section_schema(body.schema))
   with SessionLocal() as db:
     row = db.execute(text("""
@@ -293,24 +518,24 @@ async def create_section(account_id: str, body: SectionCreate, user_id: str = De
             schema = EXCLUDED.schema
       RETURNING id::text, slug, label, COALESCE(schema, '{}'::jsonb)
     """), {"a": account_id, "slug": body.slug, "label": body.label, "schema": payload}).first()
+    if rls.item_partition_strategy(db, account_id) == "section":
+      db.execute(text("SELECT ensure_item_section_partition(:sch, :slug)"), {"sch": rls._schema_name(account_id), "slug": row[1]})
     db.commit()
-    return SectionOut(id=row[0], slug=row[1], label=row[2], schema=normalize_section_schema(row[3]))
+    record_write(db)
+    schema = normalize_section_schema(row[3])
+    background_tasks.add_task(rls.sync_section_indexes, account_id, row[1], schema["fields"])
+    return SectionOut(id=row[0], slug=row[1], label=row[2], schema=schema)
 
-@app.get("/api/accounts/{account_id}/sections/{slug}", response_model=SectionOut, dependencies=[Depends(ip_allowlist)])
+@app.get("/api/accounts/{account_id}/sections/{slug}", response_model=SectionOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def get_section(account_id: str, slug: str, user_id: str = Depends(current_user)):
-  with SessionLocal() as db:
-    row = db.execute(text("""
-      SELECT id::text, slug, label, COALESCE(schema, '{}'::jsonb)
-      FROM sections
-      WHERE account_id = :a AND slug = :s
-      LIMIT 1
-    """), {"a": account_id, "s": slug}).first()
-    if not row:
+  with ReadSession() as db:
+    section = fetch_section(db, account_id, slug)
+    if not section:
       raise HTTPException(status_code=404, detail="Section not found")
-    return SectionOut(id=row[0], slug=row[1], label=row[2], schema=normalize_section_schema(row[3]))
+    return section
 
-@app.put("/api/accounts/{account_id}/sections/{slug}", response_model=SectionOut, dependencies=[Depends(ip_allowlist)])
-async def update_section(account_id: str, slug: str, body: SectionUpdate, user_id: str = Depends(current_user)):
+@app.put("/api/accounts/{account_id}/sections/{slug}", response_model=SectionOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
+async def update_section(account_id: str, slug: str, body: SectionUpdate, background_tasks: BackgroundTasks, user_id: str = Depends(current_user)):
   payload = json.dumps(normalize_section_schema(body.schema))
   with SessionLocal() as db:
     row = db.execute(text("""
@@ -323,41 +548,50 @@ async def update_section(account_id: str, slug: str, body: SectionUpdate, user_i
     if not row:
       raise HTTPException(status_code=404, detail="Section not found")
     db.commit()
-    return SectionOut(id=row[0], slug=row[1], label=row[2], schema=normalize_section_schema(row[3]))
+    record_write(db)
+    schema = normalize_section_schema(row[3])
+    background_tasks.add_task(rls.sync_section_indexes, account_id, row[1], schema["fields"])
+    return SectionOut(id=row[0], slug=row[1], label=row[2], schema=schema)
 
-@app.delete("/api/accounts/{account_id}/sections/{slug}", dependencies=[Depends(ip_allowlist)])
-async def delete_section(account_id: str, slug: str, user_id: str = Depends(current_user)):
-  schema_name = f"tenant_{account_id.replace('-', '')}"
+@app.delete("/api/accounts/{account_id}/sections/{slug}", dependencies=[Depends(ip_allowlist), Depends(account_admission)])
+async def delete_section(account_id: str, slug: str, background_tasks: BackgroundTasks, user_id: str = Depends(current_user)):
   with SessionLocal() as db:
-    # Ensure RLS context and delete items in this section for that account
+    # Ensure RLS context (and tenant search_path) and delete items in this section for that account
     db.execute(rls.set_current_account(account_id))
-    db.execute(text(f"DELETE FROM {schema_name}.items WHERE section_slug = :slug"), {"slug": slug})
+    # Section-partitioned tenants drop the whole partition; the DELETE then
+    # only has rows left in the default partition (or the plain table).
+    if rls.item_partition_strategy(db, account_id) == "section":
+      db.execute(text("SELECT drop_item_section_partition(:sch, :slug)"), {"sch": rls._schema_name(account_id), "slug": slug})
+    db.execute(text("DELETE FROM items WHERE section_slug = :slug"), {"slug": slug})
     res = db.execute(text("DELETE FROM sections WHERE account_id = :a AND slug = :s"), {"a": account_id, "s": slug})
     db.commit()
+    record_write(db)
     if res.rowcount == 0:
       raise HTTPException(status_code=404, detail="Section not found")
+  background_tasks.add_task(rls.sync_section_indexes, account_id, slug, [])
   return {"ok": True}
 
 # --- Items API (default section + per-section) ---
 
-@app.get("/api/accounts/{account_id}/items", response_model=ItemsPage, dependencies=[Depends(ip_allowlist)])
-async def list_items_default(account_id: str, limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None, user_id: str = Depends(current_user)):
-  items = rls.list_items(account_id, section="default", limit=limit, cursor=cursor)
-  next_cursor = items[-1]["id"] if items and len(items) == limit else None
-  return ItemsPage(items=items, next=next_cursor)
+@app.get("/api/accounts/{account_id}/items", response_model=ItemsPage, dependencies=[Depends(ip_allowlist), Depends(account_admission), Depends(statement_timeout(READ_TIMEOUT_MS))])
+async def list_items_default(request: Request, account_id: str, limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None, fields: Optional[str] = Query(None, description="Comma separated data keys to return"), sort: Optional[str] = Query(None, description="created_at (default), name or a data key"), dir: Optional[str] = Query(None, description="asc or desc"), user_id: str = Depends(current_user)):
+  order = load_item_sort(account_id, "default", sort, dir)
+  # Postgres renders the page body; returning a Response skips response_model validation.
+  body = await run_cancellable(request, rls.list_items_json, account_id, section="default", limit=limit, cursor=parse_cursor_param(cursor), fields=parse_fields_param(fields), sort=order)
+  return Response(content=body, media_type="application/json")
 
-@app.post("/api/accounts/{account_id}/items", response_model=ItemOut, dependencies=[Depends(ip_allowlist)])
+@app.post("/api/accounts/{account_id}/items", response_model=ItemOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def create_item_default(account_id: str, body: ItemCreate, user_id: str = Depends(current_user)):
-  return rls.create_item(account_id, section="default", name=body.name, data=body.data)
+  return await ingest.create_item(account_id, section="default", name=body.name, data=body.data)
 
-@app.get("/api/accounts/{account_id}/items/{item_id}", response_model=ItemOut, dependencies=[Depends(ip_allowlist)])
+@app.get("/api/accounts/{account_id}/items/{item_id}", response_model=ItemOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def get_item(account_id: str, item_id: str, user_id: str = Depends(current_user)):
   item = rls.get_item(account_id, item_id)
   if not item:
     raise HTTPException(status_code=404, detail="Item not found")
   return ItemOut(id=item["id"], name=item["name"], data=item["data"], created_at=item["created_at"])
 
-@app.put("/api/accounts/{account_id}/items/{item_id}", response_model=ItemOut, dependencies=[Depends(ip_allowlist)])
+@app.put("/api/accounts/{account_id}/items/{item_id}", response_model=ItemOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def update_item(account_id: str, item_id: str, body: ItemUpdate, user_id: str = Depends(current_user)):
   if body.name is None and body.data is None:
     raise HTTPException(status_code=400, detail="At least one field must be provided for update")
@@ -367,45 +601,97 @@ async def update_item(account_id: str, item_id: str, body: ItemUpdate, user_id:
     raise HTTPException(status_code=404, detail="Item not found")
   return updated
 
-@app.delete("/api/accounts/{account_id}/items/{item_id}", dependencies=[Depends(ip_allowlist)])
+@app.delete("/api/accounts/{account_id}/items/{item_id}", dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def delete_item(account_id: str, item_id: str, user_id: str = Depends(current_user)):
   rls.delete_item(account_id, item_id)
   return {"ok": True}
 
-@app.get("/api/accounts/{account_id}/sections/{slug}/items", response_model=ItemsPage, dependencies=[Depends(ip_allowlist)])
-async def list_section_items(account_id: str, slug: str, limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None, user_id: str = Depends(current_user)):
-  items = rls.list_items(account_id, section=slug, limit=limit, cursor=cursor)
-  next_cursor = items[-1]["id"] if items and len(items) == limit else None
-  return ItemsPage(items=items, next=next_cursor)
+@app.get("/api/accounts/{account_id}/sections/{slug}/items", response_model=ItemsPage, dependencies=[Depends(ip_allowlist), Depends(account_admission), Depends(statement_timeout(READ_TIMEOUT_MS))])
+async def list_section_items(request: Request, account_id: str, slug: str, limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None, fields: Optional[str] = Query(None, description="Comma separated data keys to return"), sort: Optional[str] = Query(None, description="created_at (default), name or a data key"), dir: Optional[str] = Query(None, description="asc or desc"), user_id: str = Depends(current_user)):
+  order = load_item_sort(account_id, slug, sort, dir)
+  body = await run_cancellable(request, rls.list_items_json, account_id, section=slug, limit=limit, cursor=parse_cursor_param(cursor), fields=parse_fields_param(fields), sort=order)
+  return Response(content=body, media_type="application/json")
 
-@app.post("/api/accounts/{account_id}/sections/{slug}/items", response_model=ItemOut, dependencies=[Depends(ip_allowlist)])
+@app.post("/api/accounts/{account_id}/sections/{slug}/items", response_model=ItemOut, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def create_section_item(account_id: str, slug: str, body: ItemCreate, user_id: str = Depends(current_user)):
-  return rls.create_item(account_id, section=slug, name=body.name, data=body.data)
+  return await ingest.create_item(account_id, section=slug, name=body.name, data=body.data)
+
+@app.post("/api/accounts/{account_id}/sections/{slug}/items/aggregate", response_model=AggregateOut, dependencies=[Depends(ip_allowlist), Depends(account_admission), Depends(statement_timeout(REPORT_TIMEOUT_MS))])
+async def aggregate_section_items(request: Request, account_id: str, slug: str, body: AggregateRequest, user_id: str = Depends(current_user)):
+  with ReadSession() as db:
+    row = db.execute(text("""
+      SELECT COALESCE(schema, '{}'::jsonb)
+      FROM sections
+      WHERE account_id = :a AND slug = :s
+      LIMIT 1
+    """), {"a": account_id, "s": slug}).first()
+  if not row and slug != "default":
+    raise HTTPException(status_code=404, detail="Section not found")
+  fields = normalize_section_schema(row[0] if row else None)["fields"]
+  field_types = {f["key"]: f.get("type") for f in fields}
+
+  if any(not key for key in [*body.group_by, *body.filters]):
+    raise HTTPException(status_code=400, detail="Field keys cannot be empty")
+  filters: dict = {}
+  for key, value in body.filters.items():
+    sql_type = rls.field_sql_type(field_types.get(key))
+    if isinstance(value, list):
+      filters[key] = [coerce_filter_value(key, v, sql_type) for v in value]
+    else:
+      filters[key] = coerce_filter_value(key, value, sql_type)
+  metrics: list[tuple[str, str | None]] = []
+  for m in body.metrics:
+    if m.op != "count" and not m.field:
+      raise HTTPException(status_code=400, detail=f"{m.op} requires a field")
+    sql_type = rls.field_sql_type(field_types.get(m.field)) if m.field else None
+    if m.op in ("sum", "avg") and sql_type != "numeric":
+      raise HTTPException(status_code=400, detail=f"{m.op} requires a number field, {m.field!r} is not")
+    if m.op in ("min", "max") and sql_type == "boolean":
+      raise HTTPException(status_code=400, detail=f"{m.op} is not supported for checkbox field {m.field!r}")
+    metrics.append((m.op, m.field))
+  if not metrics:
+    raise HTTPException(status_code=400, detail="At least one metric is required")
+
+  rows = await run_cancellable(
+    request, rls.aggregate_items, account_id, slug,
+    group_by=body.group_by, metrics=metrics, filters=filters, field_types=field_types, limit=body.limit,
+  )
+  return AggregateOut(rows=rows)
+
+# --- Search API ---
+
+@app.get("/api/accounts/{account_id}/search", response_model=SearchPage, dependencies=[Depends(ip_allowlist), Depends(account_admission), Depends(statement_timeout(READ_TIMEOUT_MS))])
+async def search_items(
+  request: Request,
+  account_id: str,
+  q: str = Query(..., min_length=1, max_length=200),
+  section: Optional[str] = None,
+  limit: int = Query(50, ge=1, le=200),
+  offset: int = Query(0, ge=0),
+  fields: Optional[str] = Query(None, description="Comma separated data keys to return"),
+  user_id: str = Depends(current_user),
+):
+  hits = await run_cancellable(request, rls.search_items, account_id, q, section=section, limit=limit, offset=offset, fields=parse_fields_param(fields))
+  next_offset = offset + limit if len(hits) == limit else None
+  return SearchPage(items=hits, next=next_offset)
 
 # --- Comments API ---
 
-@app.get("/api/accounts/{account_id}/items/{item_id}/comments", response_model=list[CommentOut], dependencies=[Depends(ip_allowlist)])
-async def list_item_comments(account_id: str, item_id: str, user_id: str = Depends(current_user)):
-  return rls.list_comments(account_id, item_id)
+@app.get("/api/accounts/{account_id}/items/{item_id}/comments", response_model=list[CommentOut], dependencies=[Depends(ip_allowlist), Depends(account_admission), Depends(statement_timeout(READ_TIMEOUT_MS))])
+async def list_item_comments(request: Request, account_id: str, item_id: str, user_id: str = Depends(current_user)):
+  return await run_cancellable(request, rls.list_comments, account_id, item_id)
 
-@app.post("/api/accounts/{account_id}/items/{item_id}/comments", response_model=CommentOut, status_code=201, dependencies=[Depends(ip_allowlist)])
+@app.post("/api/accounts/{account_id}/items/{item_id}/comments", response_model=CommentOut, status_code=201, dependencies=[Depends(ip_allowlist), Depends(account_admission)])
 async def create_item_comment(account_id: str, item_id: str, body: CommentCreate, user_id: str = Depends(current_user)):
-  with SessionLocal() as db:
-    user_row = db.execute(text("SELECT COALESCE(name, email) FROM users WHERE id = :u"), {"u": user_id}).first()
-    if not user_row:
-      raise HTTPException(status_code=403, detail="User not found")
-    default_user_name = user_row[0]
-
   user_name = None
   if body.user_name is not None:
     user_name = body.user_name.strip()
-  if not user_name:
-    user_name = default_user_name
 
   comment = body.comment.strip()
   if not comment:
     raise HTTPException(status_code=400, detail="Comment cannot be empty")
-  return rls.create_comment(account_id, item_id, user_id, user_name, comment)
+  # Falls back to the user's name or email when no user_name is given
+  return await ingest.create_comment(account_id, item_id, user_id, user_name or None, comment)
 
 # --- Admin API ---
 
@@ -428,9 +714,14 @@ async def list_admin_users(admin_ctx = Depends(require_admin)):
       result.append(AdminUser(id=r[0], email=r[1], name=r[2], user_type=r[3], is_active=r[4], preferences=Preferences(**prefs) if prefs else None))
     return result
 
+@app.get("/api/admin/rate-limits", response_model=AdmissionStats, dependencies=[Depends(ip_allowlist), Depends(require_admin)])
+async def rate_limit_stats():
+  # Counters are per worker process.
+  return admission_snapshot()
+
 @app.get("/api/admin/all-accounts", response_model=list[AccountOut], dependencies=[Depends(ip_allowlist), Depends(require_admin)])
 async def list_all_accounts():
-  with SessionLocal() as db:
+  with ReadSession() as db:
     rows = db.execute(text("SELECT id::text, name FROM accounts ORDER BY created_at DESC")).all()
     return [{"id": r[0], "name": r[1]} for r in rows]
 
@@ -468,6 +759,7 @@ async def create_admin(body: CreateAdmin, admin_ctx = Depends(require_admin)):
     except Exception:
       pass
     db.commit()
+    record_write(db)
     prefs = get_preferences(db, new_id) if requester_type == "super_admin" else None
     return AdminUser(id=row[0], email=row[1], name=row[2], user_type=row[3], is_active=row[4], preferences=Preferences(**prefs) if prefs else None)
 
@@ -517,6 +809,7 @@ async def update_user(user_id: str, body: AdminUserUpdate, admin_ctx=Depends(req
 
         row = db.execute(text("SELECT id::text, email, name, user_type, is_active FROM users WHERE id=:id"), {"id": user_id}).first()
         db.commit()
+        record_write(db)
         prefs = get_preferences(db, user_id) if requester_type == "super_admin" else None
         return AdminUser(id=row[0], email=row[1], name=row[2], user_type=row[3], is_active=row[4], preferences=Preferences(**prefs) if prefs else None)
 
@@ -536,4 +829,5 @@ async def delete_user(user_id: str, admin_ctx=Depends(require_admin)):
 
         db.execute(text("DELETE FROM users WHERE id=:id"), {"id": user_id})
         db.commit()
+        record_write(db)
     return None
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""Per-account admission control.
+
+Each (account, user) pair draws from a token bucket, and each account may
+only have ACCOUNT_MAX_CONCURRENCY requests in flight per worker. Either limit
+answers 429 with Retry-After, so one busy tenant cannot drain the shared
+worker and connection pools.
+
+Buckets live in process memory by default. RATE_LIMIT_BACKEND=postgres keeps
+them in the rate_limit_buckets table (db/init/007_rate_limit.sql) so all
+workers share one budget; the concurrency cap always stays per worker.
+"""
+import asyncio, logging, math, os, threading, time, uuid
+from collections import OrderedDict, defaultdict
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import text
+from database import engine
+from deps import current_user
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").strip().lower()
+# Sustained requests per second per (account, user); 0 disables the bucket
+RATE_LIMIT_PER_SECOND = float(os.environ.get("RATE_LIMIT_PER_SECOND", 20))
+RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", 60))
+# Concurrent requests per account per worker; 0 disables the cap
+ACCOUNT_MAX_CONCURRENCY = int(os.environ.get("ACCOUNT_MAX_CONCURRENCY", 8))
+_MAX_BUCKETS = 10000
+_MAX_COUNTERS = 10000
+
+_lock = threading.Lock()
+_buckets: dict[str, tuple[float, float]] = {}
+_in_flight: dict[str, int] = defaultdict(int)
+# Least recently seen account first, so the oldest are evicted at _MAX_COUNTERS
+_counters: OrderedDict[str, dict[str, int]] = OrderedDict()
+
+def _count(account_id: str, outcome: str):
+  # Caller holds _lock.
+  counts = _counters.get(account_id)
+  if counts is None:
+    if len(_counters) >= _MAX_COUNTERS:
+      _counters.popitem(last=False)
+    counts = _counters[account_id] = {"admitted": 0, "throttled": 0, "rejected": 0}
+  else:
+    _counters.move_to_end(account_id)
+  counts[outcome] += 1
+
+def _prune_buckets(now: float):
+  # A bucket that has refilled completely is the same as no bucket at all.
+  full = [
+    key for key, (tokens, updated) in _buckets.items()
+    if tokens + (now - updated) * RATE_LIMIT_PER_SECOND >= RATE_LIMIT_BURST
+  ]
+  for key in full:
+    del _buckets[key]
+
+def _take_local(key: str) -> float:
+  now = time.monotonic()
+  with _lock:
+    if key not in _buckets and len(_buckets) >= _MAX_BUCKETS:
+      _prune_buckets(now)
+    tokens, updated = _buckets.get(key, (RATE_LIMIT_BURST, now))
+    tokens = min(RATE_LIMIT_BURST, tokens + (now - updated) * RATE_LIMIT_PER_SECOND)
+    if tokens >= 1:
+      _buckets[key] = (tokens - 1, now)
+      return 0.0
+    _buckets[key] = (tokens, now)
+    return (1 - tokens) / RATE_LIMIT_PER_SECOND
+
+def _take_postgres(key: str) -> float:
+  try:
+    with engine.begin() as conn:
+      return float(conn.execute(
+        text("SELECT rate_limit_take(:k, :r, :b)"),
+        {"k": key, "r": RATE_LIMIT_PER_SECOND, "b": RATE_LIMIT_BURST},
+      ).scalar())
+  except Exception:
+    logger.warning("Postgres rate limiter unavailable; using local buckets", exc_info=True)
+    return _take_local(key)
+
+def take_token(key: str) -> float:
+  """Take one token for `key`. Returns 0 when allowed, else seconds to wait."""
+  if RATE_LIMIT_PER_SECOND <= 0:
+    return 0.0
+  if RATE_LIMIT_BACKEND == "postgres":
+    return _take_postgres(key)
+  return _take_local(key)
+
+def _request_account(request: Request) -> str | None:
+  """The account id the request targets, in canonical UUID form."""
+  raw = request.path_params.get("account_id") or request.query_params.get("account")
+  if not raw:
+    return None
+  try:
+    return str(uuid.UUID(raw))
+  except ValueError:
+    # Rejected before it can become a bucket or counter key.
+    raise HTTPException(status_code=400, detail="Invalid account id")
+
+async def account_admission(request: Request, user_id: str = Depends(current_user)):
+  """Route dependency: rate-limit the caller and hold an account concurrency slot."""
+  account_id = _request_account(request)
+  if not account_id:
+    yield
+    return
+
+  key = f"{account_id}:{user_id}"
+  # The postgres bucket is a DB round trip; keep it off the event loop.
+  wait = await asyncio.to_thread(take_token, key) if RATE_LIMIT_BACKEND == "postgres" else take_token(key)
+  if wait > 0:
+    with _lock:
+      _count(account_id, "throttled")
+    raise HTTPException(
+      status_code=429,
+      detail="Rate limit exceeded",
+      headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+  with _lock:
+    if ACCOUNT_MAX_CONCURRENCY > 0 and _in_flight[account_id] >= ACCOUNT_MAX_CONCURRENCY:
+      _count(account_id, "rejected")
+      raise HTTPException(
+        status_code=429,
+        detail="Too many concurrent requests for this account",
+        headers={"Retry-After": "1"},
+      )
+    _in_flight[account_id] += 1
+    _count(account_id, "admitted")
+  try:
+    yield
+  finally:
+    with _lock:
+      _in_flight[account_id] -= 1
+      if _in_flight[account_id] <= 0:
+        del _in_flight[account_id]
+
+def snapshot() -> dict:
+  """Limiter settings and this worker's per-account counters."""
+  with _lock:
+    accounts = [
+      {"account_id": account_id, "in_flight": _in_flight.get(account_id, 0), **counts}
+      for account_id, counts in _counters.items()
+    ]
+    bucket_count = len(_buckets)
+  accounts.sort(key=lambda a: (a["throttled"] + a["rejected"], a["admitted"]), reverse=True)
+  return {
+    "backend": RATE_LIMIT_BACKEND,
+    "per_second": RATE_LIMIT_PER_SECOND,
+    "burst": RATE_LIMIT_BURST,
+    "max_concurrency": ACCOUNT_MAX_CONCURRENCY,
+    "local_buckets": bucket_count,
+    "accounts": accounts,
+  }
@@ -1,49 +1,454 @@
-import json
+import hashlib, json, logging, os, re, time, uuid
+from contextlib import contextmanager
+from decimal import Decimal
 from sqlalchemy import text
-from database import SessionLocal
+from database import SessionLocal, ReadSession, engine, record_write, statement_timeout_ms
 
-def set_current_account(account_id: str):
-  # DB function accepts TEXT, so we bind as plain text
-  return text("SELECT set_current_account(:a)").bindparams(a=account_id)
+logger = logging.getLogger(__name__)
 
 def _schema_name(account_id: str) -> str:
   return f"tenant_{account_id.replace('-', '')}"
 
-def list_items(account_id: str, section: str, limit: int = 50, cursor: str | None = None):
-  schema = _schema_name(account_id)
-  where = "WHERE i.section_slug = :section"
+@contextmanager
+def _read_session(db=None):
+  """Reuse the caller's session (e.g. for /api/bootstrap) or open a read session."""
+  if db is not None:
+    yield db
+  else:
+    with ReadSession() as session:
+      yield session
+
+def set_current_account(account_id: str):
+  # DB function accepts TEXT, so we bind as plain text. The tenant schema is
+  # put first on the (transaction-local) search_path instead of being spliced
+  # into each query, so statement text is identical for every tenant and
+  # prepared statements / SQLAlchemy's compiled cache are shared. The route's
+  # statement_timeout is applied in the same round trip (SET LOCAL semantics).
+  timeout_ms = statement_timeout_ms.get()
+  return text(
+    "SELECT set_current_account(:a), set_config('search_path', :p, true), "
+    "set_config('statement_timeout', COALESCE(:t, current_setting('statement_timeout')), true)"
+  ).bindparams(
+    a=account_id, p=f"{_schema_name(account_id)}, public", t=str(timeout_ms) if timeout_ms else None
+  )
+
+def _data_projection(fields: list[str] | None, params: dict) -> str:
+  """SQL for the item `data` column, optionally limited to the given keys."""
+  if not fields:
+    return "COALESCE(i.data, '{}'::jsonb)"
+  params["fields"] = fields
+  return """COALESCE((
+      SELECT jsonb_object_agg(e.key, e.value)
+      FROM jsonb_each(i.data) e
+      WHERE e.key = ANY(CAST(:fields AS text[]))
+    ), '{}'::jsonb)"""
+
+def parse_item_cursor(cursor: str) -> tuple[str | None, str]:
+  """Split an items cursor (JSON `[sort value, id]`) into its parts; ValueError if malformed."""
+  try:
+    value, item_id = json.loads(cursor)
+    item_id = str(uuid.UUID(item_id))
+  except (TypeError, ValueError, AttributeError):
+    raise ValueError("Invalid cursor")
+  return (None if value is None else str(value)), item_id
+
+# Column sort keys; anything else sorts on that key of the item data.
+_COLUMN_SORTS = {"created_at": ("i.created_at", "timestamptz"), "name": ("i.name", "text")}
+
+def _item_page_query(section: str, limit: int, cursor: str | None, fields: list[str] | None, sort: tuple[str, str | None, str] | None) -> tuple[str, dict, str]:
+  """SQL and params for one page of a section's items, plus its direction.
+
+  `sort` is (key, field type, "asc" | "desc") and defaults to newest first.
+  Pages are keyset paginated on (sort value, id): each row carries its
+  `cursor`, and the last row's cursor fetches the following page. Shared by
+  list_items and list_items_json so both return the same page.
+  """
+  key, field_type, direction = sort or ("created_at", None, "desc")
+  direction = "ASC" if direction == "asc" else "DESC"
   params: dict = {"limit": limit, "section": section}
+  if key in _COLUMN_SORTS:
+    sort_sql, sql_type = _COLUMN_SORTS[key]
+    nullable = False
+    where = "WHERE i.section_slug = :section"
+  else:
+    sort_sql, sql_type = typed_field_sql(key, field_type), field_sql_type(field_type)
+    nullable = True
+    # The section goes in as a literal so the planner can match the partial
+    # index that sync_section_indexes builds for sortable fields.
+    where = f"WHERE i.section_slug = {_sql_literal(section)}"
   if cursor:
-    where += " AND i.id > :cursor"
-    params["cursor"] = cursor
+    value, params["cursor_id"] = parse_item_cursor(cursor)
+    after = ">" if direction == "ASC" else "<"
+    # NULL sort values come last ascending and first descending (Postgres'
+    # default, which an index scans in either direction).
+    if value is None:
+      cond = f"({sort_sql} IS NULL AND i.id {after} CAST(:cursor_id AS uuid))"
+      if direction == "DESC":
+        cond = f"({cond} OR {sort_sql} IS NOT NULL)"
+    else:
+      params["cursor_value"] = value
+      cond = f"({sort_sql}, i.id) {after} (CAST(:cursor_value AS {sql_type}), CAST(:cursor_id AS uuid))"
+      if nullable and direction == "ASC":
+        cond = f"({cond} OR {sort_sql} IS NULL)"
+    where += f" AND {cond}"
+  data_sql = _data_projection(fields, params)
   sql = f"""
   SELECT
-    i.id::text,
+    i.id,
     i.name,
-    COALESCE(i.data, '{{}}'::jsonb) AS data,
+    {data_sql} AS data,
     i.created_at,
     COALESCE((
       SELECT COUNT(*)::int
-      FROM {schema}.comments c
+      FROM comments c
       WHERE c.item_id = i.id
-    ), 0) AS comment_count
-  FROM {schema}.items AS i
+    ), 0) AS comment_count,
+    {sort_sql} AS sort_value,
+    json_build_array(({sort_sql})::text, i.id)::text AS cursor
+  FROM items AS i
   {where}
-  ORDER BY i.id
+  ORDER BY {sort_sql} {direction}, i.id {direction}
   LIMIT :limit
   """
-  with SessionLocal() as db:
+  return sql, params, direction
+
+def list_items(account_id: str, section: str, limit: int = 50, cursor: str | None = None, fields: list[str] | None = None, sort: tuple[str, str | None, str] | None = None, db=None) -> dict:
+  """One page of items as `{"items": [...], "next": cursor or None}`."""
+  page_sql, params, direction = _item_page_query(section, limit, cursor, fields, sort)
+  sql = f"SELECT p.id::text, p.name, p.data, p.created_at, p.comment_count, p.cursor FROM ({page_sql}) p ORDER BY p.sort_value {direction}, p.id {direction}"
+  with _read_session(db) as db:
     db.execute(set_current_account(account_id))
     rows = db.execute(text(sql), params).all()
-    return [
-      {"id": r[0], "name": r[1], "data": r[2], "created_at": r[3], "comment_count": r[4]}
-      for r in rows
-    ]
+    return {
+      "items": [
+        {"id": r[0], "name": r[1], "data": r[2], "created_at": r[3], "comment_count": r[4]}
+        for r in rows
+      ],
+      "next": rows[-1][5] if len(rows) == limit else None,
+    }
 
-def create_item(account_id: str, section: str, name: str, data: dict):
+def list_items_json(account_id: str, section: str, limit: int = 50, cursor: str | None = None, fields: list[str] | None = None, sort: tuple[str, str | None, str] | None = None) -> bytes:
+  """Same page as list_items, but rendered to JSON by Postgres.
+
+  Returns the encoded `{"items": [...], "next": ...}` body so handlers can
+  hand it straight to the client without decoding the JSONB documents or
+  building a model per row.
+  """
+  page_sql, params, direction = _item_page_query(section, limit, cursor, fields, sort)
+  reverse = "ASC" if direction == "DESC" else "DESC"
+  sql = f"""
+  WITH page AS ({page_sql})
+  SELECT json_build_object(
+    'items', COALESCE(json_agg(json_build_object(
+      'id', p.id::text,
+      'name', p.name,
+      'data', p.data,
+      'created_at', p.created_at,
+      'comment_count', p.comment_count
+    ) ORDER BY p.sort_value {direction}, p.id {direction}), '[]'::json),
+    'next', CASE WHEN COUNT(*) = :limit THEN (array_agg(p.cursor ORDER BY p.sort_value {reverse}, p.id {reverse}))[1] END
+  )::text
+  FROM page p
+  """
+  with ReadSession() as db:
+    db.execute(set_current_account(account_id))
+    body = db.execute(text(sql), params).scalar()
+    return body.encode()
+
+# ts_headline wraps matches in these control characters; clients escape the
+# snippet and then swap them for highlight markup.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+_HEADLINE_OPTIONS = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", MaxFragments=2, MinWords=5, MaxWords=20'
+
+def _prefix_tsquery(q: str) -> str | None:
+  """Turn free text into a prefix-matching tsquery (`foo:* & bar:*`)."""
+  terms = re.findall(r"\w+", q.lower())
+  if not terms:
+    return None
+  return " & ".join(f"{t}:*" for t in terms)
+
+def search_items(account_id: str, q: str, section: str | None = None, limit: int = 50, offset: int = 0, fields: list[str] | None = None):
+  tsquery = _prefix_tsquery(q)
+  if not tsquery:
+    return []
+  where = "WHERE i.search_vector @@ query"
+  params: dict = {"tsq": tsquery, "limit": limit, "offset": offset, "hl": _HEADLINE_OPTIONS}
+  if section:
+    where += " AND i.section_slug = :section"
+    params["section"] = section
+  data_sql = _data_projection(fields, params)
+  # Headlines are computed in the outer query so only the returned page pays for them.
+  sql = f"""
+  SELECT
+    hit.id::text,
+    hit.name,
+    hit.section_slug,
+    hit.data,
+    hit.created_at,
+    hit.rank,
+    ts_headline(
+      'simple',
+      hit.name || ' ' || COALESCE((SELECT string_agg(e.value, ' ') FROM jsonb_each_text(hit.full_data) e), ''),
+      to_tsquery('simple', :tsq),
+      :hl
+    ) AS headline,
+    COALESCE((
+      SELECT COUNT(*)::int
+      FROM comments c
+      WHERE c.item_id = hit.id
+    ), 0) AS comment_count
+  FROM (
+    SELECT
+      i.id,
+      i.name,
+      i.section_slug,
+      {data_sql} AS data,
+      COALESCE(i.data, '{{}}'::jsonb) AS full_data,
+      i.created_at,
+      ts_rank_cd(i.search_vector, query) AS rank
+    FROM items AS i, to_tsquery('simple', :tsq) AS query
+    {where}
+    ORDER BY rank DESC, i.id
+    LIMIT :limit OFFSET :offset
+  ) AS hit
+  ORDER BY hit.rank DESC, hit.id
+  """
+  with ReadSession() as db:
+    db.execute(set_current_account(account_id))
+    rows = db.execute(text(sql), params).all()
+    return [dict(r._mapping) for r in rows]
+
+AGGREGATE_CACHE_SECONDS = float(os.environ.get("AGGREGATE_CACHE_SECONDS", 0))
+_aggregate_cache: dict[str, tuple[float, list]] = {}
+
+# Section schema field types that map to a non-text SQL type.
+FIELD_SQL_TYPES = {"number": "numeric", "checkbox": "boolean", "boolean": "boolean"}
+
+def _sql_literal(value: str) -> str:
+  # Escape ":" too, or text() would read e.g. a key "a:b" as a bind parameter.
+  return "'" + value.replace("'", "''").replace(":", "\\:") + "'"
+
+def field_sql_type(field_type: str | None) -> str:
+  return FIELD_SQL_TYPES.get((field_type or "").lower(), "text")
+
+def typed_field_sql(key: str, field_type: str | None, column: str = "i.data") -> str:
+  """Read `data[key]` as the SQL type implied by the section schema.
+
+  Values whose JSON type does not match read as NULL instead of failing the cast.
+  The expression is immutable, so sync_section_indexes can index exactly what
+  queries filter and group on.
+  """
+  ref = f"{column}->{_sql_literal(key)}"
+  sql_type = field_sql_type(field_type)
+  if sql_type == "numeric":
+    return f"(CASE WHEN jsonb_typeof({ref}) = 'number' THEN ({column}->>{_sql_literal(key)})::numeric END)"
+  if sql_type == "boolean":
+    return f"(CASE WHEN jsonb_typeof({ref}) = 'boolean' THEN ({column}->>{_sql_literal(key)})::boolean END)"
+  return f"({column}->>{_sql_literal(key)})"
+
+def _short_hash(value: str) -> str:
+  return hashlib.md5(value.encode()).hexdigest()[:10]
+
+def sync_section_indexes(account_id: str, section: str, fields: list[dict]):
+  """Make the per-field indexes of a section match its schema.
+
+  Fields flagged `indexed` or `sortable` get a partial expression index on
+  the tenant items table (scoped to the section), or a plain one on the
+  section's partition when items are partitioned by section; indexes for fields that
+  were removed, unflagged or changed type are dropped. Each index is on
+  (field, id): that serves aggregate filters on the field and the keyset
+  order of item pages sorted by it (_item_page_query), both of which name
+  the section as a literal so the partial predicate matches. Builds run
+  CONCURRENTLY, so this must be called outside a request transaction
+  (e.g. as a background task).
+  """
   schema = _schema_name(account_id)
+  prefix = f"items_f_{_short_hash(section)}_"
+  wanted: dict[str, str] = {}
+  for field in fields:
+    if not (field.get("indexed") or field.get("sortable")):
+      continue
+    key = field["key"]
+    field_type = field.get("type")
+    name = prefix + _short_hash(f"{key}:{field_sql_type(field_type)}:id")
+    wanted[name] = typed_field_sql(key, field_type, column="data") + ", id"
+
+  with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+    strategy = item_partition_strategy(conn, account_id)
+    table, where = f"{schema}.items", f"WHERE section_slug = {_sql_literal(section)}"
+    if strategy == "section":
+      # Index only the section's own partition. A parent index would put an
+      # (empty) copy on every other section's partition.
+      for name in conn.execute(text("""
+        SELECT c.relname
+        FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+        WHERE x.indrelid = to_regclass(:t) AND starts_with(c.relname, :prefix)
+      """), {"t": table, "prefix": prefix}).scalars().all():
+        try:
+          conn.execute(text(f'DROP INDEX IF EXISTS {schema}."{name}"'))
+        except Exception:
+          logger.exception("Failed to drop index %s.%s", schema, name)
+      table, where = f'{schema}."{_section_partition(section)}"', ""
+      if not conn.execute(text("SELECT to_regclass(:t) IS NOT NULL"), {"t": table}).scalar():
+        return
+    partitioned = strategy == "month"
+    rows = conn.execute(text("""
+      SELECT c.relname, x.indisvalid
+      FROM pg_index x
+      JOIN pg_class c ON c.oid = x.indexrelid
+      WHERE x.indrelid = to_regclass(:t) AND starts_with(c.relname, :prefix)
+    """), {"t": table, "prefix": prefix}).all()
+    # An interrupted concurrent build leaves an invalid index behind; rebuild it.
+    # A partitioned parent stays invalid until every partition is attached,
+    # which the build below completes rather than starting over.
+    existing = {r[0] for r in rows if r[1]}
+    stale = [r[0] for r in rows if r[0] not in wanted or not (r[1] or partitioned)]
+
+    for name in stale:
+      try:
+        if partitioned:
+          conn.execute(text(f'DROP INDEX IF EXISTS {schema}."{name}"'))
+        else:
+          conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {schema}."{name}"'))
+      except Exception:
+        logger.exception("Failed to drop index %s.%s", schema, name)
+    for name, expr in wanted.items():
+      if name in existing:
+        continue
+      try:
+        if partitioned:
+          _create_partitioned_index(conn, schema, name, expr, section)
+        else:
+          conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON {table} ({expr}) {where}'))
+      except Exception:
+        logger.exception("Failed to build index %s.%s", schema, name)
+
+def item_partition_strategy(db, account_id: str) -> str | None:
+  """'section', 'month' or None (plain table) for a tenant's items.
+
+  Read from the catalog rather than through db/init/008_item_partitioning.sql,
+  so it also works where that migration has not been applied.
+  """
+  return db.execute(text("""
+    SELECT CASE partstrat WHEN 'l' THEN 'section' WHEN 'r' THEN 'month' END
+    FROM pg_partitioned_table
+    WHERE partrelid = to_regclass(:t)
+  """), {"t": f"{_schema_name(account_id)}.items"}).scalar()
+
+def _section_partition(section: str) -> str:
+  """Name of a section's items partition (see ensure_item_section_partition)."""
+  return "items_s_" + hashlib.md5(section.encode()).hexdigest()[:16]
+
+def _create_partitioned_index(conn, schema: str, name: str, expr: str, section: str):
+  """Build an index on month-partitioned items without locking out writes.
+
+  The parent index is created ON ONLY (instantly, invalid), each partition's
+  index is built CONCURRENTLY and attached; the parent turns valid once all
+  are attached, and partitions created later inherit it.
+  """
+  where = f"WHERE section_slug = {_sql_literal(section)}"
+  conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON ONLY {schema}.items ({expr}) {where}'))
+  partitions = conn.execute(text("""
+    SELECT c.relname
+    FROM pg_inherits h JOIN pg_class c ON c.oid = h.inhrelid
+    WHERE h.inhparent = to_regclass(:t)
+  """), {"t": f"{schema}.items"}).scalars().all()
+  covered = set(conn.execute(text("""
+    SELECT t.relname
+    FROM pg_inherits h
+    JOIN pg_index x ON x.indexrelid = h.inhrelid
+    JOIN pg_class t ON t.oid = x.indrelid
+    WHERE h.inhparent = to_regclass(:i)
+  """), {"i": f'{schema}."{name}"'}).scalars().all())
+  for partition in partitions:
+    if partition in covered:
+      continue
+    child = f"{name}_{_short_hash(partition)[:8]}"
+    valid = conn.execute(
+      text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:i)"),
+      {"i": f'{schema}."{child}"'},
+    ).scalar()
+    if valid is False:
+      conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {schema}."{child}"'))
+    conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{child}" ON {schema}."{partition}" ({expr}) {where}'))
+    conn.execute(text(f'ALTER INDEX {schema}."{name}" ATTACH PARTITION {schema}."{child}"'))
+
+def _json_value(val):
+  return float(val) if isinstance(val, Decimal) else val
+
+def aggregate_items(account_id: str, section: str, group_by: list[str], metrics: list[tuple[str, str | None]], filters: dict, field_types: dict[str, str], limit: int = 1000):
+  """Group and aggregate a section's items in one SQL statement.
+
+  `metrics` holds (op, field) pairs; `filters` maps field keys to a value or a
+  list of values. Callers validate ops against `field_types` and coerce filter
+  values to the text form of the field's SQL type beforehand.
+  """
+  cache_key = json.dumps([account_id, section, group_by, metrics, filters, limit], sort_keys=True, default=str)
+  if AGGREGATE_CACHE_SECONDS > 0:
+    hit = _aggregate_cache.get(cache_key)
+    if hit and hit[0] > time.monotonic():
+      return hit[1]
+
+  params: dict = {"limit": limit}
+  select = []
+  for key in group_by:
+    select.append(typed_field_sql(key, field_types.get(key)))
+  metric_names = []
+  for op, field in metrics:
+    if op == "count" and not field:
+      select.append("COUNT(*)")
+      metric_names.append("count")
+      continue
+    expr = typed_field_sql(field, field_types.get(field))
+    select.append("COUNT(" + expr + ")" if op == "count" else f"{op.upper()}({expr})")
+    metric_names.append(f"{op}_{field}")
+
+  # A literal section (not a bind parameter, which prepared statements turn
+  # into a generic plan) lets the planner use the fields' partial indexes.
+  where = [f"i.section_slug = {_sql_literal(section)}"]
+  for idx, (key, value) in enumerate(sorted(filters.items())):
+    sql_type = field_sql_type(field_types.get(key))
+    expr = typed_field_sql(key, field_types.get(key))
+    name = f"f{idx}"
+    if isinstance(value, list):
+      where.append(f"{expr} = ANY(CAST(:{name} AS {sql_type}[]))")
+      params[name] = value
+    elif value is None:
+      where.append(f"{expr} IS NULL")
+    else:
+      where.append(f"{expr} = CAST(:{name} AS {sql_type})")
+      params[name] = value
+
+  group_sql = ""
+  if group_by:
+    positions = ", ".join(str(i + 1) for i in range(len(group_by)))
+    group_sql = f"GROUP BY {positions} ORDER BY {positions}"
   sql = f"""
-  INSERT INTO {schema}.items (section_slug, name, data)
+  SELECT {', '.join(select)}
+  FROM items AS i
+  WHERE {' AND '.join(where)}
+  {group_sql}
+  LIMIT :limit
+  """
+  with ReadSession() as db:
+    db.execute(set_current_account(account_id))
+    rows = db.execute(text(sql), params).all()
+
+  result = []
+  for r in rows:
+    group = {key: _json_value(r[i]) for i, key in enumerate(group_by)}
+    values = {name: _json_value(r[len(group_by) + i]) for i, name in enumerate(metric_names)}
+    result.append({"group": group, "values": values})
+  if AGGREGATE_CACHE_SECONDS > 0:
+    if len(_aggregate_cache) >= 1024:
+      _aggregate_cache.clear()
+    _aggregate_cache[cache_key] = (time.monotonic() + AGGREGATE_CACHE_SECONDS, result)
+  return result
+
+def create_item(account_id: str, section: str, name: str, data: dict):
+  sql = """
+  INSERT INTO items (section_slug, name, data)
   VALUES (:s, :n, CAST(:d AS jsonb))
   RETURNING id::text, name, data, created_at
   """
@@ -52,10 +457,10 @@ def create_item(account_id: str, section: str, name: str, data: dict):
     db.execute(set_current_account(account_id))
     row = db.execute(text(sql), {"s": section, "n": name, "d": payload}).first()
     db.commit()
+    record_write(db)
     return {"id": row[0], "name": row[1], "data": row[2], "created_at": row[3]}
 
 def update_item(account_id: str, item_id: str, name: str | None, data: dict | None):
-  schema = _schema_name(account_id)
   params: dict = {"id": item_id}
   sets = []
 
@@ -63,7 +468,7 @@ def update_item(account_id: str, item_id: str, name: str | None, data: dict | No
     db.execute(set_current_account(account_id))
 
     if data is not None:
-      current_row = db.execute(text(f"SELECT COALESCE(data, '{{}}'::jsonb) FROM {schema}.items WHERE id = :id"), params).first()
+      current_row = db.execute(text("SELECT COALESCE(data, '{}'::jsonb) FROM items WHERE id = :id"), params).first()
       if not current_row:
         return None
       current_data = current_row[0] if isinstance(current_row[0], dict) else {}
@@ -80,7 +485,7 @@ def update_item(account_id: str, item_id: str, name: str | None, data: dict | No
       return None
 
     sql = f"""
-    UPDATE {schema}.items
+    UPDATE items
     SET {', '.join(sets)}
     WHERE id = :id
     RETURNING id::text, name, data, created_at
@@ -88,35 +493,34 @@ def update_item(account_id: str, item_id: str, name: str | None, data: dict | No
 
     row = db.execute(text(sql), params).first()
     db.commit()
+    record_write(db)
     if not row:
       return None
     return {"id": row[0], "name": row[1], "data": row[2], "created_at": row[3]}
 
 def delete_item(account_id: str, item_id: str):
-  schema = _schema_name(account_id)
-  sql = f"DELETE FROM {schema}.items WHERE id = :id"
+  sql = "DELETE FROM items WHERE id = :id"
   with SessionLocal() as db:
     db.execute(set_current_account(account_id))
     db.execute(text(sql), {"id": item_id})
     db.commit()
+    record_write(db)
 
-def list_comments(account_id: str, item_id: str):
-  schema = _schema_name(account_id)
-  sql = f"""
+def list_comments(account_id: str, item_id: str, db=None):
+  sql = """
   SELECT id::text, item_id::text, user_name, comment, created_at
-  FROM {schema}.comments
+  FROM comments
   WHERE item_id = :item_id
   ORDER BY created_at ASC
   """
-  with SessionLocal() as db:
+  with _read_session(db) as db:
     db.execute(set_current_account(account_id))
     rows = db.execute(text(sql), {"item_id": item_id}).all()
     return [dict(r._mapping) for r in rows]
 
 def create_comment(account_id: str, item_id: str, user_id: str, user_name: str, comment: str):
-  schema = _schema_name(account_id)
-  sql = f"""
-  INSERT INTO {schema}.comments (item_id, user_id, user_name, comment)
+  sql = """
+  INSERT INTO comments (item_id, user_id, user_name, comment)
   VALUES (:item_id, :user_id, :user_name, :comment)
   RETURNING id::text, item_id::text, user_name, comment, created_at
   """
@@ -125,17 +529,54 @@ def create_comment(account_id: str, item_id: str, user_id: str, user_name: str,
     params = {"item_id": item_id, "user_id": user_id, "user_name": user_name, "comment": comment}
     row = db.execute(text(sql), params).first()
     db.commit()
+    record_write(db)
     return dict(row._mapping)
 
-def get_item(account_id: str, item_id: str):
-  schema = _schema_name(account_id)
-  sql = f"""
-  SELECT id::text, name, COALESCE(data, '{{}}'::jsonb), section_slug, created_at
-  FROM {schema}.items
+def insert_items(db, account_id: str, rows: list[dict]) -> list[dict]:
+  """Insert several items of one tenant in one statement (see ingest.py).
+
+  Rows carry client-generated ids; results come back in the same order.
+  Runs inside the caller's transaction.
+  """
+  db.execute(set_current_account(account_id))
+  result = db.execute(text("""
+    INSERT INTO items (id, section_slug, name, data)
+    SELECT * FROM unnest(CAST(:ids AS uuid[]), CAST(:sections AS text[]), CAST(:names AS text[]), CAST(:data AS jsonb[]))
+    RETURNING id::text, name, data, created_at
+  """), {
+    "ids": [r["id"] for r in rows],
+    "sections": [r["section"] for r in rows],
+    "names": [r["name"] for r in rows],
+    "data": [json.dumps(r["data"] or {}) for r in rows],
+  }).all()
+  by_id = {r[0]: {"id": r[0], "name": r[1], "data": r[2], "created_at": r[3]} for r in result}
+  return [by_id[r["id"]] for r in rows]
+
+def insert_comments(db, account_id: str, rows: list[dict]) -> list[dict]:
+  """Comment counterpart of insert_items."""
+  db.execute(set_current_account(account_id))
+  result = db.execute(text("""
+    INSERT INTO comments (id, item_id, user_id, user_name, comment)
+    SELECT * FROM unnest(CAST(:ids AS uuid[]), CAST(:item_ids AS uuid[]), CAST(:user_ids AS uuid[]), CAST(:user_names AS text[]), CAST(:comments AS text[]))
+    RETURNING id::text, item_id::text, user_name, comment, created_at
+  """), {
+    "ids": [r["id"] for r in rows],
+    "item_ids": [r["item_id"] for r in rows],
+    "user_ids": [r["user_id"] for r in rows],
+    "user_names": [r["user_name"] for r in rows],
+    "comments": [r["comment"] for r in rows],
+  }).all()
+  by_id = {r[0]: dict(r._mapping) for r in result}
+  return [by_id[r["id"]] for r in rows]
+
+def get_item(account_id: str, item_id: str, db=None):
+  sql = """
+  SELECT id::text, name, COALESCE(data, '{}'::jsonb), section_slug, created_at
+  FROM items
   WHERE id = :id
   LIMIT 1
   """
-  with SessionLocal() as db:
+  with _read_session(db) as db:
     db.execute(set_current_account(account_id))
     row = db.execute(text(sql), {"id": item_id}).first()
     if not row:
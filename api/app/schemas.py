@@ -59,6 +59,37 @@ class ItemsPage(BaseModel):
     items: List[ItemOut]
     next: Optional[str]
 
+class SearchHit(BaseModel):
+    id: str
+    name: str
+    section_slug: str
+    data: dict
+    created_at: datetime
+    comment_count: int = 0
+    rank: float
+    headline: str
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next: Optional[int]
+
+class AggregateMetric(BaseModel):
+    op: Literal["count", "sum", "min", "max", "avg"]
+    field: Optional[str] = None
+
+class AggregateRequest(BaseModel):
+    group_by: List[str] = Field(default_factory=list)
+    metrics: List[AggregateMetric] = Field(default_factory=lambda: [AggregateMetric(op="count")])
+    filters: dict = Field(default_factory=dict)
+    limit: int = Field(1000, ge=1, le=10000)
+
+class AggregateRow(BaseModel):
+    group: dict
+    values: dict
+
+class AggregateOut(BaseModel):
+    rows: List[AggregateRow]
+
 class AdminUser(BaseModel):
     id: str
     email: EmailStr
@@ -105,3 +136,26 @@ class CommentOut(BaseModel):
     user_name: Optional[str] = None
     comment: str
     created_at: datetime
+
+class BootstrapOut(BaseModel):
+    me: MeOut
+    accounts: List[AccountOut]
+    section: Optional[SectionOut] = None
+    items: Optional[ItemsPage] = None
+    item: Optional[ItemOut] = None
+    comments: Optional[List[CommentOut]] = None
+
+class AccountAdmission(BaseModel):
+    account_id: str
+    in_flight: int
+    admitted: int
+    throttled: int
+    rejected: int
+
+class AdmissionStats(BaseModel):
+    backend: str
+    per_second: float
+    burst: float
+    max_concurrency: int
+    local_buckets: int
+    accounts: List[AccountAdmission]
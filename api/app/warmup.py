@@ -0,0 +1,122 @@
+"""Startup warm-up and readiness.
+
+Right after startup a background thread opens WARMUP_CONNECTIONS pooled
+connections (and one per replica). On each connection it runs the hot
+tenant read for the most recently created accounts, which loads the catalog
+caches of that backend and SQLAlchemy's compiled statement cache. It also
+runs the JWT code path once. Each tenant is warmed under its own savepoint,
+so one broken tenant is logged and skipped rather than failing the rest.
+
+/readyz answers 503 until a warm-up pass has succeeded for every tenant it
+read and the database answers. A pass that failed (e.g. the DB was down at
+startup) or skipped broken tenants is retried in the background on the next
+probe, and the instance stays out of rotation until a retry succeeds.
+"""
+import logging, os, threading, time
+from jose import jwt
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from database import engine, replica_engines, DB_POOL_SIZE
+from deps import JWT_SECRET
+import rls
+
+logger = logging.getLogger(__name__)
+
+WARMUP_CONNECTIONS = int(os.environ.get("WARMUP_CONNECTIONS", DB_POOL_SIZE))
+WARMUP_TENANTS = int(os.environ.get("WARMUP_TENANTS", 10))
+
+# attempted: a warm-up has finished (successfully or not); running: one is in progress
+state = {"attempted": False, "running": False, "error": None, "warmed_at": None, "seconds": None, "failed_tenants": 0}
+_lock = threading.Lock()
+
+def _warm_tenant(db, account_id: str) -> bool:
+  try:
+    with db.begin_nested():
+      rls.list_items(account_id, "default", limit=1, db=db)
+    return True
+  except Exception:
+    logger.warning("Warm-up of tenant %s failed", account_id, exc_info=True)
+    return False
+
+def _warm_connections(eng, count: int, account_ids: list[str]) -> int:
+  """Warm `count` connections of `eng`; returns how many tenant reads failed."""
+  # Hold all connections at once so the pool really opens `count` of them.
+  conns = []
+  failed = 0
+  try:
+    for _ in range(count):
+      conn = eng.connect()
+      conns.append(conn)
+      with Session(bind=conn) as db:
+        db.execute(text("SELECT 1"))
+        failed += sum(not _warm_tenant(db, account_id) for account_id in account_ids)
+        db.rollback()
+  finally:
+    for conn in conns:
+      conn.close()
+  return failed
+
+def warm_up():
+  """Run one warm-up pass and record the outcome in `state`."""
+  started = time.monotonic()
+  failed = 0
+  error = None
+  try:
+    jwt.decode(jwt.encode({"sub": "warmup"}, JWT_SECRET, algorithm="HS256"), JWT_SECRET, algorithms=["HS256"])
+    with engine.connect() as conn:
+      account_ids = conn.execute(
+        text("SELECT id::text FROM accounts ORDER BY created_at DESC LIMIT :n"),
+        {"n": WARMUP_TENANTS},
+      ).scalars().all()
+    # Only pooled (not overflow) connections stay open after warm-up.
+    failed = _warm_connections(engine, max(1, min(WARMUP_CONNECTIONS, DB_POOL_SIZE)), account_ids)
+    for replica in replica_engines:
+      try:
+        _warm_connections(replica, 1, account_ids)
+      except Exception:
+        # Reads fall back to the primary, so a lagging replica does not matter here.
+        logger.warning("Replica warm-up failed", exc_info=True)
+  except Exception as e:
+    error = str(e)
+    logger.warning("Warm-up failed; it is retried from /readyz", exc_info=True)
+  with _lock:
+    state.update(
+      attempted=True, running=False, error=error, failed_tenants=failed,
+      warmed_at=None if error else time.time(), seconds=round(time.monotonic() - started, 3),
+    )
+  if not error:
+    logger.info("Warm-up done in %.3fs (%d tenant reads failed)", state["seconds"], failed)
+
+def start():
+  """Start a warm-up in a background thread unless one is running or has succeeded."""
+  with _lock:
+    if state["running"] or (state["attempted"] and not state["error"] and not state["failed_tenants"]):
+      return
+    state["running"] = True
+  threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
+def check_ready() -> tuple[bool, dict]:
+  """Readiness probe: a warm-up has fully succeeded and the primary answers."""
+  with _lock:
+    snapshot = dict(state)
+  if not snapshot["attempted"]:
+    return False, {"ready": False, "warming": True}
+  if snapshot["error"] or snapshot["failed_tenants"]:
+    start()
+    return False, {
+      "ready": False,
+      "warming": snapshot["running"],
+      "warmup_error": snapshot["error"],
+      "warmup_failed_tenants": snapshot["failed_tenants"],
+    }
+  try:
+    with engine.connect() as conn:
+      conn.execute(text("SELECT 1"))
+  except Exception as e:
+    return False, {"ready": False, "error": str(e)}
+  pool = engine.pool
+  return True, {
+    "ready": True,
+    "warmup_seconds": snapshot["seconds"],
+    "pool": {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()},
+  }
@@ -0,0 +1,22 @@
+-- Full-text search over item names and the string values of item data.
+-- The tsvector is a stored generated column, so Postgres keeps it current on
+-- every insert/update without triggers.
+CREATE OR REPLACE FUNCTION ensure_item_search(sch TEXT) RETURNS VOID AS $$
+BEGIN
+  EXECUTE format('ALTER TABLE %I.items ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+      setweight(to_tsvector(''simple'', coalesce(name, '''')), ''A'') ||
+      setweight(jsonb_to_tsvector(''simple'', coalesce(data, ''{}''::jsonb), ''["string"]''), ''B'')
+    ) STORED', sch);
+  EXECUTE format('CREATE INDEX IF NOT EXISTS items_search_idx ON %I.items USING gin (search_vector)', sch);
+END; $$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE sch text;
+BEGIN
+  FOR sch IN SELECT nspname FROM pg_namespace WHERE nspname LIKE 'tenant\_%' LOOP
+    IF to_regclass(format('%I.items', sch)) IS NOT NULL THEN
+      PERFORM ensure_item_search(sch);
+    END IF;
+  END LOOP;
+END $$;
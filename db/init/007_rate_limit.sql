@@ -0,0 +1,33 @@
+-- Shared token buckets for RATE_LIMIT_BACKEND=postgres, so every API worker
+-- draws from the same per-(account, user) budget. The table is unlogged: a
+-- crash just refills everyone's buckets.
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+  key TEXT PRIMARY KEY,
+  tokens DOUBLE PRECISION NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+-- Take one token from bucket k. Returns 0 when allowed, otherwise the number
+-- of seconds until a token will be available.
+CREATE OR REPLACE FUNCTION rate_limit_take(k TEXT, rate DOUBLE PRECISION, burst DOUBLE PRECISION)
+RETURNS DOUBLE PRECISION AS $$
+DECLARE
+  prev_tokens DOUBLE PRECISION;
+  prev_at TIMESTAMPTZ;
+  now_at TIMESTAMPTZ;
+  available DOUBLE PRECISION;
+BEGIN
+  INSERT INTO rate_limit_buckets(key, tokens) VALUES (k, burst)
+  ON CONFLICT (key) DO NOTHING;
+  SELECT tokens, updated_at INTO prev_tokens, prev_at
+  FROM rate_limit_buckets WHERE key = k FOR UPDATE;
+  now_at := clock_timestamp();
+  available := LEAST(burst, prev_tokens + GREATEST(EXTRACT(EPOCH FROM now_at - prev_at), 0) * rate);
+  IF available >= 1 THEN
+    UPDATE rate_limit_buckets SET tokens = available - 1, updated_at = now_at WHERE key = k;
+    RETURN 0;
+  END IF;
+  UPDATE rate_limit_buckets SET tokens = available, updated_at = now_at WHERE key = k;
+  RETURN (1 - available) / rate;
+END; $$ LANGUAGE plpgsql;
+
@@ -0,0 +1,228 @@
+-- Opt-in partitioned layout for tenant items.
+--
+--   section: LIST partitions on section_slug, one per section, so section
+--            queries prune to one partition and deleting a section drops it.
+--   month:   RANGE partitions on created_at (items_pYYYYMM); retention drops
+--            or detaches whole months instead of deleting rows.
+--
+-- Both keep an items_default partition for rows no partition claims yet.
+-- A partitioned table's primary key must include the partition key, so
+-- comments.item_id cannot keep its foreign key; triggers take over its
+-- insert check and ON DELETE CASCADE.
+
+CREATE OR REPLACE FUNCTION item_partition_strategy(sch TEXT) RETURNS TEXT AS $$
+  SELECT CASE p.partstrat WHEN 'l' THEN 'section' WHEN 'r' THEN 'month' END
+  FROM pg_partitioned_table p
+  WHERE p.partrelid = to_regclass(format('%I.items', sch));
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION delete_item_comments() RETURNS trigger AS $$
+DECLARE still_there BOOLEAN;
+BEGIN
+  -- Rows handed from the default partition to a new one are not deleted.
+  IF current_setting('app.moving_items', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+  -- Neither is a row an UPDATE moved to another partition (section change).
+  EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I.items WHERE id = $1)', TG_TABLE_SCHEMA) INTO still_there USING OLD.id;
+  IF NOT still_there THEN
+    EXECUTE format('DELETE FROM %I.comments WHERE item_id = $1', TG_TABLE_SCHEMA) USING OLD.id;
+  END IF;
+  RETURN NULL;
+END; $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION check_comment_item() RETURNS trigger AS $$
+DECLARE item_exists BOOLEAN;
+BEGIN
+  EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I.items WHERE id = $1)', TG_TABLE_SCHEMA) INTO item_exists USING NEW.item_id;
+  IF NOT item_exists THEN
+    RAISE EXCEPTION 'item % does not exist', NEW.item_id USING ERRCODE = 'foreign_key_violation';
+  END IF;
+  RETURN NEW;
+END; $$ LANGUAGE plpgsql;
+
+-- Give a section its own partition, moving any of its rows out of the default.
+CREATE OR REPLACE FUNCTION ensure_item_section_partition(sch TEXT, slug TEXT) RETURNS VOID AS $$
+DECLARE part TEXT := 'items_s_' || left(md5(slug), 16);
+BEGIN
+  IF item_partition_strategy(sch) IS DISTINCT FROM 'section' OR to_regclass(format('%I.%I', sch, part)) IS NOT NULL THEN
+    RETURN;
+  END IF;
+  EXECUTE format('CREATE TABLE %I.%I (LIKE %I.items INCLUDING DEFAULTS INCLUDING GENERATED)', sch, part, sch);
+  PERFORM set_config('app.moving_items', 'on', true);
+  EXECUTE format('WITH moved AS (
+      DELETE FROM %I.items_default WHERE section_slug = %L
+      RETURNING id, section_slug, name, data, created_at
+    )
+    INSERT INTO %I.%I (id, section_slug, name, data, created_at) SELECT * FROM moved',
+    sch, slug, sch, part);
+  PERFORM set_config('app.moving_items', 'off', true);
+  EXECUTE format('ALTER TABLE %I.items ATTACH PARTITION %I.%I FOR VALUES IN (%L)', sch, sch, part, slug);
+END; $$ LANGUAGE plpgsql;
+
+-- Create the partition for the month containing `month`, same hand-off.
+CREATE OR REPLACE FUNCTION ensure_item_month_partition(sch TEXT, month DATE) RETURNS VOID AS $$
+DECLARE
+  lo DATE := date_trunc('month', month)::date;
+  hi DATE := (date_trunc('month', month) + interval '1 month')::date;
+  part TEXT := 'items_p' || to_char(date_trunc('month', month), 'YYYYMM');
+BEGIN
+  IF item_partition_strategy(sch) IS DISTINCT FROM 'month' OR to_regclass(format('%I.%I', sch, part)) IS NOT NULL THEN
+    RETURN;
+  END IF;
+  EXECUTE format('CREATE TABLE %I.%I (LIKE %I.items INCLUDING DEFAULTS INCLUDING GENERATED)', sch, part, sch);
+  PERFORM set_config('app.moving_items', 'on', true);
+  EXECUTE format('WITH moved AS (
+      DELETE FROM %I.items_default WHERE created_at >= %L AND created_at < %L
+      RETURNING id, section_slug, name, data, created_at
+    )
+    INSERT INTO %I.%I (id, section_slug, name, data, created_at) SELECT * FROM moved',
+    sch, lo, hi, sch, part);
+  PERFORM set_config('app.moving_items', 'off', true);
+  EXECUTE format('ALTER TABLE %I.items ATTACH PARTITION %I.%I FOR VALUES FROM (%L) TO (%L)', sch, sch, part, lo, hi);
+END; $$ LANGUAGE plpgsql;
+
+-- Keep this and next month's partitions in place for every month-partitioned tenant.
+CREATE OR REPLACE FUNCTION maintain_item_partitions() RETURNS VOID AS $$
+DECLARE sch text;
+BEGIN
+  FOR sch IN SELECT nspname FROM pg_namespace WHERE nspname LIKE 'tenant\_%' LOOP
+    IF item_partition_strategy(sch) = 'month' THEN
+      PERFORM ensure_item_month_partition(sch, current_date);
+      PERFORM ensure_item_month_partition(sch, (current_date + interval '1 month')::date);
+    END IF;
+  END LOOP;
+END; $$ LANGUAGE plpgsql;
+
+-- Convert a tenant's items table in place. Takes an exclusive lock on items
+-- for the duration of the copy, so run it in a maintenance window.
+CREATE OR REPLACE FUNCTION partition_tenant_items(sch TEXT, mode TEXT) RETURNS VOID AS $$
+DECLARE
+  legacy TEXT := 'items_unpartitioned';
+  pol RECORD;
+  idx RECORD;
+  slug TEXT;
+  month DATE;
+  index_defs TEXT[] := '{}';
+  def TEXT;
+  target TEXT;
+  has_comments BOOLEAN;
+BEGIN
+  IF mode NOT IN ('section', 'month') THEN
+    RAISE EXCEPTION 'unknown item partitioning mode %, expected section or month', mode;
+  END IF;
+  IF item_partition_strategy(sch) IS NOT NULL THEN
+    RETURN;
+  END IF;
+
+  has_comments := to_regclass(format('%I.comments', sch)) IS NOT NULL;
+  IF has_comments THEN
+    EXECUTE format('ALTER TABLE %I.comments DROP CONSTRAINT IF EXISTS comments_item_id_fkey', sch);
+  END IF;
+  EXECUTE format('ALTER TABLE %I.items RENAME TO %I', sch, legacy);
+
+  EXECUTE format('CREATE TABLE %I.items (LIKE %I.%I INCLUDING DEFAULTS INCLUDING GENERATED) PARTITION BY %s',
+    sch, sch, legacy, CASE mode WHEN 'section' THEN 'LIST (section_slug)' ELSE 'RANGE (created_at)' END);
+  EXECUTE format('CREATE TABLE %I.items_default PARTITION OF %I.items DEFAULT', sch, sch);
+  IF mode = 'section' THEN
+    FOR slug IN EXECUTE format('SELECT DISTINCT section_slug FROM %I.%I', sch, legacy) LOOP
+      PERFORM ensure_item_section_partition(sch, slug);
+    END LOOP;
+  ELSE
+    FOR month IN EXECUTE format(
+      'SELECT generate_series(date_trunc(''month'', COALESCE(min(created_at), now())), now() + interval ''1 month'', interval ''1 month'')::date FROM %I.%I',
+      sch, legacy)
+    LOOP
+      PERFORM ensure_item_month_partition(sch, month);
+    END LOOP;
+  END IF;
+  EXECUTE format('INSERT INTO %I.items (id, section_slug, name, data, created_at)
+    SELECT id, section_slug, name, data, created_at FROM %I.%I', sch, sch, legacy);
+
+  -- Carry over RLS policies and per-field section indexes before the old table goes.
+  EXECUTE format('ALTER TABLE %I.items ENABLE ROW LEVEL SECURITY', sch);
+  FOR pol IN SELECT policyname, qual, with_check FROM pg_policies WHERE schemaname = sch AND tablename = legacy LOOP
+    EXECUTE format('CREATE POLICY %I ON %I.items', pol.policyname, sch)
+      || CASE WHEN pol.qual IS NOT NULL THEN format(' USING (%s)', pol.qual) ELSE '' END
+      || CASE WHEN pol.with_check IS NOT NULL THEN format(' WITH CHECK (%s)', pol.with_check) ELSE '' END;
+  END LOOP;
+  FOR idx IN
+    SELECT c.relname, x.indexrelid FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+    WHERE x.indrelid = to_regclass(format('%I.%I', sch, legacy)) AND starts_with(c.relname, 'items_f_')
+  LOOP
+    target := format(' ON %I.items ', sch);
+    IF mode = 'section' THEN
+      -- Section-scoped indexes (items_f_<md5(slug)[:10]>_*) go on that
+      -- section's partition only, not on the parent and so every partition.
+      EXECUTE format('SELECT s FROM (SELECT DISTINCT section_slug AS s FROM %I.%I) d
+        WHERE starts_with(%L, ''items_f_'' || left(md5(s), 10) || ''_'')', sch, legacy, idx.relname) INTO slug;
+      CONTINUE WHEN slug IS NULL;
+      target := format(' ON %I.%I ', sch, 'items_s_' || left(md5(slug), 16));
+    END IF;
+    def := replace(pg_get_indexdef(idx.indexrelid), format(' ON %I.%I ', sch, legacy), target);
+    index_defs := index_defs || def;
+  END LOOP;
+  EXECUTE format('DROP TABLE %I.%I', sch, legacy);
+
+  EXECUTE format('ALTER TABLE %I.items ADD CONSTRAINT items_pkey PRIMARY KEY (id, %I)',
+    sch, CASE mode WHEN 'section' THEN 'section_slug' ELSE 'created_at' END);
+  FOREACH def IN ARRAY index_defs LOOP
+    EXECUTE def;
+  END LOOP;
+  PERFORM ensure_item_search(sch);
+  PERFORM ensure_item_page_index(sch);
+
+  IF has_comments THEN
+    EXECUTE format('DROP TRIGGER IF EXISTS items_delete_comments ON %I.items', sch);
+    EXECUTE format('CREATE TRIGGER items_delete_comments AFTER DELETE ON %I.items
+      FOR EACH ROW EXECUTE FUNCTION delete_item_comments()', sch);
+    EXECUTE format('DROP TRIGGER IF EXISTS comments_check_item ON %I.comments', sch);
+    EXECUTE format('CREATE TRIGGER comments_check_item BEFORE INSERT OR UPDATE OF item_id ON %I.comments
+      FOR EACH ROW EXECUTE FUNCTION check_comment_item()', sch);
+  END IF;
+END; $$ LANGUAGE plpgsql;
+
+-- Drop a section's partition (and its items' comments) in one step.
+-- Returns false when the tenant is not section-partitioned or the section
+-- has no partition of its own.
+CREATE OR REPLACE FUNCTION drop_item_section_partition(sch TEXT, slug TEXT) RETURNS BOOLEAN AS $$
+DECLARE part TEXT := 'items_s_' || left(md5(slug), 16);
+BEGIN
+  IF item_partition_strategy(sch) IS DISTINCT FROM 'section' OR to_regclass(format('%I.%I', sch, part)) IS NULL THEN
+    RETURN false;
+  END IF;
+  IF to_regclass(format('%I.comments', sch)) IS NOT NULL THEN
+    EXECUTE format('DELETE FROM %I.comments c USING %I.%I i WHERE c.item_id = i.id', sch, sch, part);
+  END IF;
+  EXECUTE format('DROP TABLE %I.%I', sch, part);
+  RETURN true;
+END; $$ LANGUAGE plpgsql;
+
+-- Retention for month-partitioned tenants: remove every month that ends on
+-- or before `cutoff`. With keep_detached the partitions are detached (and
+-- their comments kept) for archiving instead of dropped.
+CREATE OR REPLACE FUNCTION drop_item_partitions_before(sch TEXT, cutoff DATE, keep_detached BOOLEAN DEFAULT false)
+RETURNS SETOF TEXT AS $$
+DECLARE part TEXT;
+BEGIN
+  IF item_partition_strategy(sch) IS DISTINCT FROM 'month' THEN
+    RETURN;
+  END IF;
+  FOR part IN
+    SELECT c.relname FROM pg_inherits h JOIN pg_class c ON c.oid = h.inhrelid
+    WHERE h.inhparent = to_regclass(format('%I.items', sch))
+      AND c.relname ~ '^items_p[0-9]{6}$'
+      AND (to_date(substr(c.relname, 8), 'YYYYMM') + interval '1 month')::date <= cutoff
+    ORDER BY c.relname
+  LOOP
+    IF keep_detached THEN
+      EXECUTE format('ALTER TABLE %I.items DETACH PARTITION %I.%I', sch, sch, part);
+    ELSE
+      IF to_regclass(format('%I.comments', sch)) IS NOT NULL THEN
+        EXECUTE format('DELETE FROM %I.comments c USING %I.%I i WHERE c.item_id = i.id', sch, sch, part);
+      END IF;
+      EXECUTE format('DROP TABLE %I.%I', sch, part);
+    END IF;
+    RETURN NEXT part;
+  END LOOP;
+END; $$ LANGUAGE plpgsql;
@@ -0,0 +1,17 @@
+-- Item pages are keyset paginated newest first on (created_at, id) within a
+-- section (rls._item_page_query); this index serves them in that order.
+-- On a partitioned items table the index cascades to every partition.
+CREATE OR REPLACE FUNCTION ensure_item_page_index(sch TEXT) RETURNS VOID AS $$
+BEGIN
+  EXECUTE format('CREATE INDEX IF NOT EXISTS items_page_idx ON %I.items (section_slug, created_at, id)', sch);
+END; $$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE sch text;
+BEGIN
+  FOR sch IN SELECT nspname FROM pg_namespace WHERE nspname LIKE 'tenant\_%' LOOP
+    IF to_regclass(format('%I.items', sch)) IS NOT NULL THEN
+      PERFORM ensure_item_page_index(sch);
+    END IF;
+  END LOOP;
+END $$;
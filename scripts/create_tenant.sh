@@ -30,5 +30,10 @@ BEGIN
       USING ( current_setting(''app.current_account'')::uuid = ''$ACC_ID'' )
       WITH CHECK ( current_setting(''app.current_account'')::uuid = ''$ACC_ID'' )', sch);
   END IF;
+  PERFORM ensure_item_search(sch);
+  PERFORM ensure_item_page_index(sch);
 END $$;"
+if [[ -n "${ITEM_PARTITIONING:-}" ]]; then
+  $PSQL -c "SELECT partition_tenant_items('tenant_${ACC_ID//-/}', '$ITEM_PARTITIONING');"
+fi
 printf "Created account '%s' (%s) with schema tenant_%s\n" "$ACC_NAME" "$ACC_ID" "${ACC_ID//-/}"
@@ -0,0 +1,42 @@
+#!/usr/bin/env bash
+set -euo pipefail
+usage() {
+  cat <<USAGE
+Usage:
+  $0 convert <ACCOUNT_ID> section|month    partition an account's items table
+  $0 maintain                              create this/next month's partitions (run daily)
+  $0 retain <ACCOUNT_ID> <YYYY-MM-DD> [--detach]
+                                           drop (or detach) months ending on/before the date
+USAGE
+  exit 1
+}
+CMD=${1:-}
+source "$(dirname "$0")/../.env"
+PSQL="docker compose exec -T db psql -U $POSTGRES_USER -d $POSTGRES_DB -v ON_ERROR_STOP=1"
+schema_for() {
+  if [[ ! "$1" =~ ^[0-9a-fA-F-]{36}$ ]]; then echo "Invalid account id: $1" >&2; exit 1; fi
+  echo "tenant_${1//-/}"
+}
+
+case "$CMD" in
+  convert)
+    ACC_ID=${2:-}; MODE=${3:-}
+    if [[ -z "$ACC_ID" || ( "$MODE" != "section" && "$MODE" != "month" ) ]]; then usage; fi
+    SCH=$(schema_for "$ACC_ID")
+    $PSQL -c "SELECT partition_tenant_items('$SCH', '$MODE');"
+    printf "Partitioned items of %s by %s\n" "$ACC_ID" "$MODE"
+    ;;
+  maintain)
+    $PSQL -c "SELECT maintain_item_partitions();"
+    ;;
+  retain)
+    ACC_ID=${2:-}; CUTOFF=${3:-}; DETACH=false
+    if [[ -z "$ACC_ID" || ! "$CUTOFF" =~ ^[0-9]{4}-[0-9]{2}-[0-9]{2}$ ]]; then usage; fi
+    if [[ "${4:-}" == "--detach" ]]; then DETACH=true; fi
+    SCH=$(schema_for "$ACC_ID")
+    $PSQL -c "SELECT drop_item_partitions_before('$SCH', '$CUTOFF', $DETACH);"
+    ;;
+  *)
+    usage
+    ;;
+esac
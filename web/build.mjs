@@ -0,0 +1,153 @@
+// Production build for the static frontend.
+//
+// Bundles every page's entry module from js/ with esbuild (minified, shared
+// code split into chunks), gives each output a content hash in its file name,
+// rewrites the <script>/<link> references in public/*.html, and writes .gz and
+// .br siblings for nginx's gzip_static/brotli_static. Hashed files never
+// change, so nginx serves them as immutable; only the HTML is revalidated.
+//
+// Usage: npm run build   (output in dist/)
+import { build } from 'esbuild';
+import { promises as fs } from 'node:fs';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+import zlib from 'node:zlib';
+
+const ROOT = path.dirname(fileURLToPath(import.meta.url));
+const PUBLIC_DIR = path.join(ROOT, 'public');
+const JS_DIR = path.join(ROOT, 'js');
+const OUT_DIR = path.join(ROOT, 'dist');
+const COMPRESSIBLE = new Set(['.js', '.css', '.html', '.svg', '.json', '.map']);
+const MIN_COMPRESS_BYTES = 512;
+
+const SCRIPT_RE = /<script\b([^>]*?)\bsrc="\/js\/([\w.-]+\.js)(?:\?[^"]*)?"([^>]*)><\/script>/g;
+const STYLESHEET_RE = /href="\/app\.css(?:\?[^"]*)?"/g;
+
+function toUrl(outPath) {
+  return '/' + path.relative(OUT_DIR, outPath).split(path.sep).join('/');
+}
+
+async function htmlPages() {
+  const names = await fs.readdir(PUBLIC_DIR);
+  const pages = [];
+  for (const name of names.filter(n => n.endsWith('.html'))) {
+    pages.push({ name, html: await fs.readFile(path.join(PUBLIC_DIR, name), 'utf8') });
+  }
+  return pages;
+}
+
+function entryModules(pages) {
+  const entries = new Set();
+  for (const { html } of pages) {
+    for (const match of html.matchAll(SCRIPT_RE)) entries.add(match[2]);
+  }
+  return [...entries].sort();
+}
+
+async function bundleScripts(entries) {
+  const result = await build({
+    absWorkingDir: ROOT,
+    entryPoints: entries.map(name => path.join(JS_DIR, name)),
+    outdir: path.join(OUT_DIR, 'js'),
+    entryNames: '[name]-[hash]',
+    chunkNames: 'chunks/[name]-[hash]',
+    bundle: true,
+    splitting: true,
+    format: 'esm',
+    target: ['es2020'],
+    minify: true,
+    metafile: true,
+    logLevel: 'info',
+  });
+  // entry file name -> { url, preload: [chunk urls it imports statically] }
+  const manifest = new Map();
+  for (const [outPath, output] of Object.entries(result.metafile.outputs)) {
+    if (!output.entryPoint) continue;
+    const preload = output.imports
+      .filter(imp => imp.kind === 'import-statement' && !imp.external)
+      .map(imp => toUrl(path.resolve(ROOT, imp.path)));
+    manifest.set(path.basename(output.entryPoint), { url: toUrl(path.resolve(ROOT, outPath)), preload });
+  }
+  return manifest;
+}
+
+async function hashStylesheet() {
+  const css = await build({
+    absWorkingDir: ROOT,
+    entryPoints: [path.join(PUBLIC_DIR, 'app.css')],
+    outdir: OUT_DIR,
+    entryNames: '[name]-[hash]',
+    minify: true,
+    metafile: true,
+    logLevel: 'info',
+  });
+  const outPath = Object.keys(css.metafile.outputs).find(p => p.endsWith('.css'));
+  return toUrl(path.resolve(ROOT, outPath));
+}
+
+function rewriteHtml(html, manifest, cssUrl) {
+  const preloads = new Set();
+  let out = html.replace(SCRIPT_RE, (tag, before, name, after) => {
+    const entry = manifest.get(name);
+    if (!entry) return tag;
+    entry.preload.forEach(url => preloads.add(url));
+    return `<script${before}src="${entry.url}"${after}></script>`;
+  });
+  out = out.replace(STYLESHEET_RE, `href="${cssUrl}"`);
+  if (preloads.size) {
+    const links = [...preloads].map(url => `  <link rel="modulepreload" href="${url}">`).join('\n');
+    out = out.replace(/<\/head>/i, `${links}\n</head>`);
+  }
+  return out;
+}
+
+async function copyStatic() {
+  for (const name of await fs.readdir(PUBLIC_DIR)) {
+    if (name.endsWith('.html') || name === 'app.css') continue;
+    await fs.cp(path.join(PUBLIC_DIR, name), path.join(OUT_DIR, name), { recursive: true });
+  }
+}
+
+async function* walk(dir) {
+  for (const entry of await fs.readdir(dir, { withFileTypes: true })) {
+    const full = path.join(dir, entry.name);
+    if (entry.isDirectory()) yield* walk(full);
+    else yield full;
+  }
+}
+
+async function precompress() {
+  for await (const file of walk(OUT_DIR)) {
+    if (!COMPRESSIBLE.has(path.extname(file))) continue;
+    const data = await fs.readFile(file);
+    if (data.length < MIN_COMPRESS_BYTES) continue;
+    await fs.writeFile(`${file}.gz`, zlib.gzipSync(data, { level: 9 }));
+    await fs.writeFile(`${file}.br`, zlib.brotliCompressSync(data, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+      },
+    }));
+  }
+}
+
+async function main() {
+  await fs.rm(OUT_DIR, { recursive: true, force: true });
+  await fs.mkdir(OUT_DIR, { recursive: true });
+
+  const pages = await htmlPages();
+  const manifest = await bundleScripts(entryModules(pages));
+  const cssUrl = await hashStylesheet();
+  for (const { name, html } of pages) {
+    await fs.writeFile(path.join(OUT_DIR, name), rewriteHtml(html, manifest, cssUrl));
+  }
+  await copyStatic();
+  await precompress();
+
+  console.log(`Built ${manifest.size} entry bundles into ${path.relative(process.cwd(), OUT_DIR) || '.'}`);
+}
+
+main().catch(err => {
+  console.error(err);
+  process.exit(1);
+});
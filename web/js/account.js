@@ -1,4 +1,8 @@
-import { loadMeOrRedirect, renderShell, api, getLabels, getPreferences, escapeHtml } from './common.js';
+import { loadMeOrRedirect, renderShell, api, getLabels, getPreferences, escapeHtml, renderHighlight } from './common.js';
+import { latest, isAbortError } from './store.js';
+
+const SEARCH_DEBOUNCE_MS = 250;
+const MIN_SEARCH_CHARS = 2;
 
 function qs(name) {
   const m = new URLSearchParams(location.search).get(name);
@@ -50,7 +54,9 @@ function slugify(val) {
   const sectionCancel = document.getElementById('sectionCancel');
 
   const sectionSearch = document.getElementById('sectionSearch');
+  const itemSearchResults = document.getElementById('itemSearchResults');
   let allSections = [];
+  let searchTimer = 0;
 
   const menuButton = document.getElementById('accountMenuButton');
   const menu = document.getElementById('accountMenu');
@@ -162,9 +168,55 @@ function slugify(val) {
     }).join('');
   }
 
+  function renderItemHits(hits) {
+    if (!itemSearchResults) return;
+    if (!hits.length) {
+      itemSearchResults.innerHTML = `<p class="small" style="text-align:center">No ${escapeHtml(labels.items_label.toLowerCase())} match your search.</p>`;
+      return;
+    }
+    const sectionLabels = new Map(allSections.map(s => [s.slug, s.label]));
+    itemSearchResults.innerHTML = `<h3>${escapeHtml(labels.items_label)}</h3>` + hits.map(hit => {
+      const href = `/item.html?account=${encodeURIComponent(accountId)}&section=${encodeURIComponent(hit.section_slug)}&item=${encodeURIComponent(hit.id)}`;
+      const sectionLabel = sectionLabels.get(hit.section_slug) || hit.section_slug;
+      return `
+        <div class="card" style="margin-bottom:8px;">
+          <div style="display:flex;justify-content:space-between;align-items:center;gap:8px;">
+            <div>
+              <strong>${escapeHtml(hit.name)}</strong>
+              <div class="small">${escapeHtml(sectionLabel)}</div>
+              <div class="small search-snippet">${renderHighlight(hit.headline)}</div>
+            </div>
+            <div>
+              <a class="btn" href="${href}">Open</a>
+            </div>
+          </div>
+        </div>
+      `;
+    }).join('');
+  }
+
+  async function searchItems(term) {
+    const params = new URLSearchParams({ q: term, limit: '20' });
+    try {
+      const page = await latest('account-item-search', `/api/accounts/${accountId}/search?${params}`);
+      renderItemHits(page.items || []);
+    } catch (err) {
+      if (isAbortError(err)) return;
+      itemSearchResults.innerHTML = `<p class="small">Search failed: ${escapeHtml(err.message)}</p>`;
+    }
+  }
+
   if (sectionSearch) {
     sectionSearch.addEventListener('input', (e) => {
       renderSections(e.target.value);
+      const term = e.target.value.trim();
+      clearTimeout(searchTimer);
+      if (!itemSearchResults) return;
+      if (term.length < MIN_SEARCH_CHARS) {
+        itemSearchResults.innerHTML = '';
+        return;
+      }
+      searchTimer = setTimeout(() => searchItems(term), SEARCH_DEBOUNCE_MS);
     });
   }
 
@@ -1,4 +1,4 @@
-import { loadMeOrRedirect, renderShell, api, escapeHtml } from './common.js';
+import { loadBootstrapOrRedirect, renderShell, api, escapeHtml } from './common.js';
 document.addEventListener('DOMContentLoaded', () => {
     const params = new URLSearchParams(window.location.search);
     const accountId = params.get('account_id');
@@ -18,15 +18,13 @@ document.addEventListener('DOMContentLoaded', () => {
     const commentsList = document.getElementById('comments-list');
     const commentForm = document.getElementById('comment-form');
 
-    const loadItemDetails = async (me) => {
-        try {
-            const item = await api(`/api/accounts/${accountId}/items/${itemId}`);
-            pageTitle.textContent = `Comments for "${item.name}"`;
-            itemMeta.textContent = `Item ID: ${item.id}`;
-        } catch (error) {
-            console.error('Error loading item details:', error);
+    const renderItemDetails = (item) => {
+        if (!item) {
             pageTitle.textContent = 'Could not load item';
+            return;
         }
+        pageTitle.textContent = `Comments for "${item.name}"`;
+        itemMeta.textContent = `Item ID: ${item.id}`;
     };
 
     const renderComments = (comments) => {
@@ -80,10 +78,11 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
     (async () => {
-        const me = await loadMeOrRedirect(); if (!me) return;
-        renderShell(me);
-        await loadItemDetails(me);
-        await loadComments();
+        const boot = await loadBootstrapOrRedirect({ account: accountId, item: itemId, comments: true });
+        if (!boot) return;
+        renderShell(boot.me);
+        renderItemDetails(boot.item);
+        renderComments(boot.comments || []);
         commentForm.addEventListener('submit', handleFormSubmit);
     })();
 });
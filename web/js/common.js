@@ -1,6 +1,12 @@
 export function getToken() { return sessionStorage.getItem('token') || ''; }
 export function setToken(t) { sessionStorage.setItem('token', t); }
-export function logout() { sessionStorage.removeItem('token'); window.location.replace('/'); }
+export function logout() {
+  sessionStorage.removeItem('token');
+  sessionStorage.removeItem('sessionLsn');
+  // Cached API responses (see store.js) belong to the signed-out user.
+  Object.keys(sessionStorage).filter(k => k.startsWith('apiCache:')).forEach(k => sessionStorage.removeItem(k));
+  window.location.replace('/');
+}
 
 export function escapeHtml(str) {
   return String(str ?? '')
@@ -11,6 +17,13 @@ export function escapeHtml(str) {
     .replace(/'/g, '&#039;');
 }
 
+// Search snippets mark matches with \u0002...\u0003 (see rls.search_items).
+export function renderHighlight(headline) {
+  return escapeHtml(headline)
+    .replace(/\u0002/g, '<mark>')
+    .replace(/\u0003/g, '</mark>');
+}
+
 export const DEFAULT_LABELS = {
   accounts_label: 'Home',
   sections_label: 'Sections',
@@ -41,20 +54,53 @@ export function getLabels(user) {
   };
 }
 
+// Read-your-writes: the API returns the primary's WAL position (LSN) after a
+// write; sending the highest one seen keeps later reads off lagging replicas.
+function parseLsn(lsn) {
+  const [hi, lo] = String(lsn).split('/');
+  return BigInt('0x' + hi) * 0x100000000n + BigInt('0x' + lo);
+}
+
+function rememberLsn(lsn) {
+  if (!lsn || !/^[0-9A-Fa-f]+\/[0-9A-Fa-f]+$/.test(lsn)) return;
+  const current = sessionStorage.getItem('sessionLsn');
+  if (!current || parseLsn(lsn) > parseLsn(current)) sessionStorage.setItem('sessionLsn', lsn);
+}
+
 export async function api(path, opts = {}) {
   const headers = Object.assign({ 'Content-Type': 'application/json' }, opts.headers || {});
   const token = getToken();
   if (token) headers.Authorization = 'Bearer ' + token;
+  const minLsn = sessionStorage.getItem('sessionLsn');
+  if (minLsn) headers['X-Min-LSN'] = minLsn;
   const res = await fetch(path, Object.assign({}, opts, { headers }));
+  rememberLsn(res.headers.get('X-Session-LSN'));
   if (!res.ok) {
     const text = await res.text().catch(() => res.statusText);
-    throw new Error(text || ('HTTP ' + res.status));
+    const err = new Error(text || ('HTTP ' + res.status));
+    err.status = res.status;
+    err.retryAfter = res.headers.get('Retry-After');
+    throw err;
   }
   if (res.status === 204) return null;
   const ct = res.headers.get('content-type') || '';
   return ct.includes('application/json') ? res.json() : res.text();
 }
 
+// For request loops (paging, exports): wait out 429s from the per-account
+// rate limit, honouring Retry-After, instead of failing part way through.
+export async function apiWithBackoff(path, opts = {}, attempts = 4) {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await api(path, opts);
+    } catch (err) {
+      if (err.status !== 429 || attempt >= attempts) throw err;
+      const seconds = Number(err.retryAfter) || attempt;
+      await new Promise(resolve => setTimeout(resolve, seconds * 1000));
+    }
+  }
+}
+
 export async function loadMeOrRedirect() {
   const token = getToken();
   if (!token) { window.location.replace('/'); return null; }
@@ -62,6 +108,38 @@ export async function loadMeOrRedirect() {
   catch (e) { logout(); return null; }
 }
 
+// One round trip for a page's first paint: user, accounts and, when asked
+// for, the section with its first items page or an item with its comments.
+export async function loadBootstrapOrRedirect(params = {}) {
+  const token = getToken();
+  if (!token) { window.location.replace('/'); return null; }
+  const qs = new URLSearchParams();
+  for (const [key, val] of Object.entries(params)) {
+    if (val !== undefined && val !== null && val !== '') qs.set(key, val);
+  }
+  const query = qs.toString();
+  try { return await api('/api/bootstrap' + (query ? `?${query}` : '')); }
+  catch (e) {
+    // Unlike /api/me this can also fail on rate limits (429), timeouts (504)
+    // or a bad account/section; only an auth failure signs the user out.
+    if (e.status === 401) { logout(); return null; }
+    renderLoadError(e);
+    return null;
+  }
+}
+
+function renderLoadError(err) {
+  const main = document.querySelector('main') || document.body;
+  const message = err.status === 429 ? 'Too many requests, please wait a moment and try again.' : (err.message || 'Failed to load page');
+  main.innerHTML = `
+    <div class="card">
+      <p>${escapeHtml(message)}</p>
+      <button type="button" class="btn" id="retryLoadBtn">Retry</button>
+    </div>`;
+  const btn = document.getElementById('retryLoadBtn');
+  if (btn) btn.addEventListener('click', () => window.location.reload());
+}
+
 export function renderShell(user) {
   const labels = getLabels(user);
   const header = document.getElementById('site-header');
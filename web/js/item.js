@@ -1,4 +1,4 @@
-import { loadMeOrRedirect, renderShell, api, getLabels, escapeHtml } from './common.js';
+import { loadBootstrapOrRedirect, renderShell, getLabels, escapeHtml } from './common.js';
 
 function qs(name) {
   const m = new URLSearchParams(location.search).get(name);
@@ -195,15 +195,18 @@ function formatDateTime(val) {
 }
 
 (async () => {
-  const me = await loadMeOrRedirect(); if (!me) return;
-  renderShell(me);
-  const labels = getLabels(me);
-  document.title = labels.items_label;
-
   const accountId = qs('account');
   const sectionSlug = qs('section');
   const itemId = qs('item');
 
+  // limit=0: the section schema is needed here, its items page is not.
+  const boot = await loadBootstrapOrRedirect({ account: accountId, section: sectionSlug, item: itemId, limit: 0 });
+  if (!boot) return;
+  const me = boot.me;
+  renderShell(me);
+  const labels = getLabels(me);
+  document.title = labels.items_label;
+
   const backToSection = document.getElementById('backToSection');
   const itemNameEl = document.getElementById('itemName');
   const itemMetaEl = document.getElementById('itemMeta');
@@ -264,29 +267,18 @@ function formatDateTime(val) {
     }
   }
 
-  let accountName = `Account ${accountId}`;
-  try {
-    const myAccounts = await api('/api/me/accounts');
-    const match = myAccounts.find(a => a.id === accountId);
-    if (match) accountName = match.name;
-  } catch {
-    // ignore
-  }
+  const accountMatch = (boot.accounts || []).find(a => a.id === accountId);
+  const accountName = accountMatch ? accountMatch.name : `Account ${accountId}`;
 
-  let section = null;
+  const section = boot.section || null;
   let schemaFields = [];
   let templateFields = [];
   if (sectionSlug) {
-    try {
-      section = await api(`/api/accounts/${accountId}/sections/${encodeURIComponent(sectionSlug)}`);
+    if (section) {
       const s = section.schema || {};
       schemaFields = Array.isArray(s.fields) ? s.fields : [];
       const columnTemplate = loadColumnTemplate(accountId, sectionSlug);
       templateFields = orderFields(parseTemplate(columnTemplate).fields);
-    } catch {
-      section = null;
-      schemaFields = [];
-      templateFields = [];
     }
 
     const storedCount = loadColumnCount(accountId, sectionSlug);
@@ -316,7 +308,8 @@ function formatDateTime(val) {
   }
 
   try {
-    const item = await api(`/api/accounts/${accountId}/items/${encodeURIComponent(itemId)}`);
+    const item = boot.item;
+    if (!item) throw new Error('Item not found');
     itemNameEl.textContent = item.name;
     const sectionLabel = section ? section.label : (sectionSlug || 'No section');
     const createdCopy = item.created_at ? ` · Added ${formatDateTime(item.created_at)}` : '';
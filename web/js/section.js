@@ -1,4 +1,11 @@
-import { loadMeOrRedirect, renderShell, api, getLabels, getPreferences, escapeHtml } from './common.js';
+import { loadBootstrapOrRedirect, renderShell, api, apiWithBackoff, getLabels, getPreferences, escapeHtml, renderHighlight } from './common.js';
+import { cachedGet, prime, invalidate, latest, isAbortError } from './store.js';
+
+const PAGE_SIZE = 200;
+const ROW_OVERSCAN = 10;
+const ITEMS_MAX_AGE_MS = 15000;
+const SEARCH_DEBOUNCE_MS = 250;
+const LIST_CHANNEL = 'item-list';
 
 function qs(name) {
   const m = new URLSearchParams(location.search).get(name);
@@ -262,6 +269,19 @@ function loadSortPref(accountId, slug) {
   }
 }
 
+// Item pages come back newest first unless a sort is asked for (main.item_sort).
+function appendSortParams(params, sort) {
+  if (!sort || !sort.key || (sort.key === 'created_at' && sort.direction !== 'asc')) return;
+  const dir = sort.direction === 'asc' ? 'asc' : 'desc';
+  if (params instanceof URLSearchParams) {
+    params.set('sort', sort.key);
+    params.set('dir', dir);
+  } else {
+    params.sort = sort.key;
+    params.dir = dir;
+  }
+}
+
 function saveSortPref(accountId, slug, sortState) {
   try {
     localStorage.setItem(sortPrefKey(accountId, slug), JSON.stringify(sortState));
@@ -271,14 +291,26 @@ function saveSortPref(accountId, slug, sortState) {
 }
 
 (async () => {
-  const me = await loadMeOrRedirect(); if (!me) return;
+  const accountId = qs('account');
+  const slug = qs('slug');
+  const templateFromPrefs = accountId && slug ? parseTemplate(loadColumnTemplate(accountId, slug)) : { fields: [] };
+  const templateKeys = templateFromPrefs.fields.filter(f => f.showInTable !== false).map(f => f.key).filter(Boolean);
+  // Without a local template the server projects to the section schema's table columns.
+  const bootParams = {
+    account: accountId,
+    section: slug,
+    limit: PAGE_SIZE,
+    fields: templateKeys.length ? templateKeys.join(',') : null,
+  };
+  appendSortParams(bootParams, accountId && slug ? loadSortPref(accountId, slug) : null);
+  const boot = await loadBootstrapOrRedirect(bootParams);
+  if (!boot) return;
+  const me = boot.me;
   renderShell(me);
   const labels = getLabels(me);
   const preferences = getPreferences(me);
   const showSlugs = preferences.show_slugs;
 
-  const accountId = qs('account');
-  const slug = qs('slug');
   if (!accountId || !slug) {
     document.body.innerHTML = '<main class="container"><p>Missing account or section.</p></main>';
     return;
@@ -326,28 +358,43 @@ function saveSortPref(accountId, slug, sortState) {
     backLink.href = `/account.html?id=${encodeURIComponent(accountId)}`;
   }
 
-  let accountName = `Account ${accountId}`;
-  try {
-    const myAccounts = await api('/api/me/accounts');
-    const match = myAccounts.find(a => a.id === accountId);
-    if (match) accountName = match.name;
-  } catch {
-    // ignore
-  }
+  const accountMatch = (boot.accounts || []).find(a => a.id === accountId);
+  const accountName = accountMatch ? accountMatch.name : `Account ${accountId}`;
 
   let currentSection = null;
-  const templateFromPrefs = parseTemplate(loadColumnTemplate(accountId, slug));
   let schemaFields = templateFromPrefs.fields || [];
   let itemsData = [];
+  let nextCursor = null;
+  let loadingMore = false;
+  // Bumped whenever the list restarts from a first page (e.g. a new sort).
+  let listVersion = 0;
+  // Paging and search share one channel, so starting either aborts the
+  // other's in-flight fetch; only the newest request clears loadingMore.
+  let listRequest = 0;
+  // Server-side search results for the current term; null while browsing.
+  let searchResults = null;
+  let searchTimer = 0;
+  const itemsBaseUrl = `/api/accounts/${accountId}/sections/${encodeURIComponent(slug)}/items`;
   let columnDefs = [];
   let visibleColumns = [];
   let columnCount = null;
   const savedSort = loadSortPref(accountId, slug);
   let sortState = savedSort || { key: 'created_at', direction: 'desc' };
 
-  async function loadSectionMeta() {
-    try {
-      const section = await api(`/api/accounts/${accountId}/sections/${encodeURIComponent(slug)}`);
+  // Virtualized table state (see ensureTableShell/renderWindow)
+  let displayRows = [];
+  let activeColumns = [];
+  let tableScroller = null;
+  let tableHead = null;
+  let tableBody = null;
+  let rowHeight = 44;
+  let rowHeightMeasured = false;
+  let windowStart = -1;
+  let windowEnd = -1;
+  let windowFrame = 0;
+
+  function applySectionMeta(section) {
+    if (section) {
       currentSection = section;
       titleEl.textContent = section.label;
       metaEl.textContent = showSlugs ? `${accountName} · slug: ${section.slug}` : accountName;
@@ -355,7 +402,7 @@ function saveSortPref(accountId, slug, sortState) {
       const apiFields = Array.isArray(s.fields) ? s.fields : [];
       schemaFields = templateFromPrefs.fields.length ? templateFromPrefs.fields : apiFields;
       document.title = `${section.label} | ${labels.sections_label}`;
-    } catch {
+    } else {
       titleEl.textContent = `Section ${slug}`;
       metaEl.textContent = showSlugs ? `${accountName} · slug: ${slug}` : accountName;
       currentSection = { slug, label: slug, schema: {} };
@@ -491,35 +538,14 @@ function saveSortPref(accountId, slug, sortState) {
     return cols;
   }
 
-  function sortItems(list) {
-    const dir = sortState.direction === 'asc' ? 1 : -1;
-    const key = sortState.key;
-    return [...list].sort((a, b) => {
-      let va;
-      let vb;
-      if (key === 'name') {
-        va = a.name || '';
-        vb = b.name || '';
-      } else if (key === 'created_at') {
-        va = a.created_at ? new Date(a.created_at).getTime() : 0;
-        vb = b.created_at ? new Date(b.created_at).getTime() : 0;
-      } else {
-        const rawA = a.data && typeof a.data === 'object' ? a.data[key] : undefined;
-        const rawB = b.data && typeof b.data === 'object' ? b.data[key] : undefined;
-        va = rawA;
-        vb = rawB;
-      }
-
-      if (typeof va === 'number' && typeof vb === 'number') {
-        return (va - vb) * dir;
-      }
-      const strA = va === null || va === undefined ? '' : String(va);
-      const strB = vb === null || vb === undefined ? '' : String(vb);
-      return strA.localeCompare(strB, undefined, { numeric: true, sensitivity: 'base' }) * dir;
-    });
+  // Data keys the table needs; null means the full document (no schema to project on).
+  function projectedFields() {
+    if (!schemaFields || !schemaFields.length) return null;
+    const keys = schemaFields.filter(f => f.showInTable !== false).map(f => f.key).filter(Boolean);
+    return keys.length ? keys : null;
   }
 
-  function buildExportColumns() {
+  function buildExportColumns(exportData) {
     const cols = [];
     const seen = new Set();
     columnDefs.forEach(col => {
@@ -529,7 +555,7 @@ function saveSortPref(accountId, slug, sortState) {
     });
 
     const extras = new Set();
-    itemsData.forEach(it => {
+    exportData.forEach(it => {
       if (it.data && typeof it.data === 'object') {
         Object.keys(it.data).forEach(k => {
           if (!seen.has(k)) extras.add(k);
@@ -545,8 +571,8 @@ function saveSortPref(accountId, slug, sortState) {
     return cols;
   }
 
-  function prepareExportRows(columns) {
-    return itemsData.map(it => columns.map(col => {
+  function prepareExportRows(columns, exportData) {
+    return exportData.map(it => columns.map(col => {
       if (col.key === 'name') return normalizeExportValue(it.name);
       if (col.key === 'created_at') {
         return it.created_at ? new Date(it.created_at).toISOString() : '';
@@ -749,14 +775,25 @@ function saveSortPref(accountId, slug, sortState) {
     return new Blob([zip], { type: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' });
   }
 
-  function exportItems() {
+  async function exportItems() {
     if (!itemsData.length) {
       alert(`No ${labels.items_label.toLowerCase()} to export.`);
       return;
     }
 
-    const columns = buildExportColumns();
-    const rows = prepareExportRows(columns);
+    // The table holds projected, possibly partial pages; exports need every full document.
+    let exportData = itemsData;
+    if (projectedFields() || nextCursor) {
+      try {
+        exportData = await fetchAllItems();
+      } catch (err) {
+        alert(err.message || 'Failed to load items for export');
+        return;
+      }
+    }
+
+    const columns = buildExportColumns(exportData);
+    const rows = prepareExportRows(columns, exportData);
 
     const sectionName = (currentSection?.label || slug || 'section').replace(/[^a-z0-9]+/gi, '_').replace(/_+/g, '_').replace(/^_+|_+$/g, '') || 'section';
     const dateStamp = new Date().toISOString().split('T')[0];
@@ -789,15 +826,122 @@ function saveSortPref(accountId, slug, sortState) {
     return `<span class="sort-arrow active" aria-hidden="true">${arrow}</span>`;
   }
 
+  function currentTerm() {
+    return itemSearch ? itemSearch.value : '';
+  }
+
+  function renderRow(it) {
+    const cells = [];
+    for (const col of activeColumns) {
+      if (col.key === 'name') {
+        const snippet = it.headline ? `<div class="small search-snippet">${renderHighlight(it.headline)}</div>` : '';
+        cells.push(`<td>${escapeHtml(it.name)}${snippet}</td>`);
+      } else if (col.key === 'created_at') {
+        cells.push(`<td>${escapeHtml(formatDateTime(it.created_at))}</td>`);
+      } else {
+        const val = it.data && typeof it.data === 'object' ? it.data[col.key] : undefined;
+        if ((col.type || '').toLowerCase() === 'dropdown') {
+          const opts = [...new Set(normalizeOptions(col.options))];
+          const currentVal = val === undefined || val === null ? '' : String(val);
+          if (opts.length) {
+            if (currentVal && !opts.includes(currentVal)) opts.unshift(currentVal);
+            const optionsHtml = ['<option value="">Select…</option>', ...opts.map(o => `<option value="${escapeHtml(String(o))}"${o === currentVal ? ' selected' : ''}>${escapeHtml(String(o))}</option>`)].join('');
+            cells.push(`<td><select class="inline-dropdown" data-inline-dropdown data-item-id="${escapeHtml(it.id)}" data-col-key="${escapeHtml(col.key)}" data-prev="${escapeHtml(currentVal)}">${optionsHtml}</select></td>`);
+          } else {
+            cells.push(`<td>${formatCellValue(val)}</td>`);
+          }
+        } else {
+          cells.push(`<td>${formatCellValue(val)}</td>`);
+        }
+      }
+    }
+    const viewHref = `/item.html?account=${encodeURIComponent(accountId)}&section=${encodeURIComponent(slug)}&item=${encodeURIComponent(it.id)}`;
+    const commentsHref = `/comments.html?account_id=${encodeURIComponent(accountId)}&item_id=${encodeURIComponent(it.id)}&section_slug=${encodeURIComponent(slug)}`;
+    const commentCount = Number.isFinite(it.comment_count) ? it.comment_count : 0;
+    const commentCountText = commentCount === 1 ? '1 comment' : `${commentCount} comments`;
+    const commentCountClass = commentCount > 0 ? 'comment-count comment-count--active' : 'comment-count';
+    const commentsBtn = `<a class="btn small comment-btn" href="${commentsHref}" aria-label="View ${escapeHtml(commentCountText)}">` +
+      `<span class="comment-icon" aria-hidden="true">💬</span>` +
+      `<span class="comment-label">Comments</span>` +
+      `<span class="${commentCountClass}" aria-hidden="true">${escapeHtml(String(commentCount))}</span>` +
+      `</a>`;
+    const deleteBtn = `<button type="button" class="btn small danger" data-action="delete-item" data-item-id="${escapeHtml(it.id)}">Delete</button>`;
+    cells.push(`<td style="width:1%;white-space:nowrap;">` +
+      `<a class="btn small" href="${viewHref}">View</a> ` +
+      `${commentsBtn} ` +
+      `${deleteBtn}` +
+      `</td>`);
+    return `<tr>${cells.join('')}</tr>`;
+  }
+
+  // The table is rendered once as a shell; scrolling only swaps the rows
+  // inside the visible window, padded by spacer rows above and below.
+  function ensureTableShell() {
+    if (tableScroller && itemsTableContainer.contains(tableScroller)) return;
+    itemsTableContainer.innerHTML = '<div class="table-wrapper virtual-scroll"><table><thead></thead><tbody></tbody></table></div>';
+    tableScroller = itemsTableContainer.querySelector('.virtual-scroll');
+    tableHead = tableScroller.querySelector('thead');
+    tableBody = tableScroller.querySelector('tbody');
+    windowStart = -1;
+    windowEnd = -1;
+    tableScroller.addEventListener('scroll', scheduleWindowRender, { passive: true });
+  }
+
+  function scheduleWindowRender() {
+    if (windowFrame) return;
+    windowFrame = requestAnimationFrame(() => {
+      windowFrame = 0;
+      renderWindow();
+    });
+  }
+
+  function renderWindow(force = false) {
+    if (!tableScroller || !tableBody) return;
+    const total = displayRows.length;
+    const scrollTop = tableScroller.scrollTop;
+    const viewport = tableScroller.clientHeight || window.innerHeight;
+    const start = Math.max(0, Math.floor(scrollTop / rowHeight) - ROW_OVERSCAN);
+    const end = Math.min(total, Math.ceil((scrollTop + viewport) / rowHeight) + ROW_OVERSCAN);
+    if (!force && start === windowStart && end === windowEnd) return;
+    windowStart = start;
+    windowEnd = end;
+
+    const colspan = activeColumns.length + 1;
+    const spacer = (height) => height > 0
+      ? `<tr class="virtual-spacer" aria-hidden="true"><td colspan="${colspan}" style="height:${height}px"></td></tr>`
+      : '';
+    tableBody.innerHTML = spacer(start * rowHeight) +
+      displayRows.slice(start, end).map(renderRow).join('') +
+      spacer((total - end) * rowHeight);
+
+    if (!rowHeightMeasured && end > start) {
+      const rendered = tableBody.querySelectorAll('tr:not(.virtual-spacer)');
+      const measured = Array.from(rendered).reduce((sum, tr) => sum + tr.offsetHeight, 0) / rendered.length;
+      if (measured > 0) {
+        rowHeightMeasured = true;
+        if (Math.abs(measured - rowHeight) > 1) {
+          rowHeight = measured;
+          renderWindow(true);
+          return;
+        }
+      }
+    }
+
+    if (end >= total - ROW_OVERSCAN) {
+      loadNextPage();
+    }
+  }
+
   function renderItemsTable(term = '') {
     const visibleSet = new Set(visibleColumns);
-    let activeColumns = columnDefs.filter(c => visibleSet.has(c.key));
+    activeColumns = columnDefs.filter(c => visibleSet.has(c.key));
     if (Number.isFinite(columnCount) && columnCount > 0) {
       activeColumns = activeColumns.slice(0, columnCount);
     }
 
-    let displayItems = itemsData;
-    if (term) {
+    const searching = !!(term && searchResults && searchResults.term === term.trim());
+    let displayItems = searching ? searchResults.items : itemsData;
+    if (term && !searching) {
       const lowerTerm = term.toLowerCase();
       displayItems = itemsData.filter(item => {
         // Check name
@@ -816,6 +960,7 @@ function saveSortPref(accountId, slug, sortState) {
 
     if (!displayItems.length) {
       itemsTableContainer.innerHTML = '';
+      displayRows = [];
       if (itemsEmptyState) {
         if (!term && !itemsData.length) {
           itemsEmptyState.classList.remove('hidden');
@@ -835,166 +980,230 @@ function saveSortPref(accountId, slug, sortState) {
     }
     setExportEnabled(true);
 
-    if (activeColumns.length && !activeColumns.some(c => c.key === sortState.key)) {
-      const fallback = activeColumns[0];
-      sortState = { key: fallback.key, direction: fallback.key === 'created_at' ? 'desc' : 'asc' };
-    }
-
+    const sorted = !searching;
     const headerCells = activeColumns.map(col => {
-      const ariaSort = sortState.key === col.key ? (sortState.direction === 'asc' ? 'ascending' : 'descending') : 'none';
+      const ariaSort = sorted && sortState.key === col.key ? (sortState.direction === 'asc' ? 'ascending' : 'descending') : 'none';
       return `<th><button type="button" class="sort-toggle" data-key="${escapeHtml(col.key)}" aria-sort="${ariaSort}">${escapeHtml(col.label)} ${renderSortIndicator(col)}</button></th>`;
     }).join('');
 
-    const rowsHtml = sortItems(displayItems).map(it => {
-      const cells = [];
-      for (const col of activeColumns) {
-        if (col.key === 'name') {
-          cells.push(`<td>${escapeHtml(it.name)}</td>`);
-        } else if (col.key === 'created_at') {
-          cells.push(`<td>${escapeHtml(formatDateTime(it.created_at))}</td>`);
-        } else {
-          const val = it.data && typeof it.data === 'object' ? it.data[col.key] : undefined;
-          if ((col.type || '').toLowerCase() === 'dropdown') {
-            const opts = [...new Set(normalizeOptions(col.options))];
-            const currentVal = val === undefined || val === null ? '' : String(val);
-            if (opts.length) {
-              if (currentVal && !opts.includes(currentVal)) opts.unshift(currentVal);
-              const optionsHtml = ['<option value="">Select…</option>', ...opts.map(o => `<option value="${escapeHtml(String(o))}"${o === currentVal ? ' selected' : ''}>${escapeHtml(String(o))}</option>`)].join('');
-              cells.push(`<td><select class="inline-dropdown" data-inline-dropdown data-item-id="${escapeHtml(it.id)}" data-col-key="${escapeHtml(col.key)}" data-prev="${escapeHtml(currentVal)}">${optionsHtml}</select></td>`);
-            } else {
-              cells.push(`<td>${formatCellValue(val)}</td>`);
-            }
-          } else {
-            cells.push(`<td>${formatCellValue(val)}</td>`);
-          }
-        }
+    ensureTableShell();
+    tableHead.innerHTML = `<tr>${headerCells}<th></th></tr>`;
+    // Pages come back in sortState order (see itemsUrl) and search hits in
+    // relevance order, so rows are shown as received and appended pages
+    // never reshuffle the rows above them.
+    displayRows = displayItems;
+    renderWindow(true);
+  }
+
+  // Row controls are re-created as the window scrolls, so listen on the container.
+  itemsTableContainer.addEventListener('click', async (e) => {
+    const sortBtn = e.target.closest('.sort-toggle');
+    if (sortBtn) {
+      const key = sortBtn.getAttribute('data-key');
+      if (!key) return;
+      if (sortState.key === key) {
+        sortState = { key, direction: sortState.direction === 'asc' ? 'desc' : 'asc' };
+      } else {
+        sortState = { key, direction: key === 'created_at' ? 'desc' : 'asc' };
       }
-      const viewHref = `/item.html?account=${encodeURIComponent(accountId)}&section=${encodeURIComponent(slug)}&item=${encodeURIComponent(it.id)}`;
-      const commentsHref = `/comments.html?account_id=${encodeURIComponent(accountId)}&item_id=${encodeURIComponent(it.id)}&section_slug=${encodeURIComponent(slug)}`;
-      const commentCount = Number.isFinite(it.comment_count) ? it.comment_count : 0;
-      const commentCountText = commentCount === 1 ? '1 comment' : `${commentCount} comments`;
-      const commentCountClass = commentCount > 0 ? 'comment-count comment-count--active' : 'comment-count';
-      const commentsBtn = `<a class="btn small comment-btn" href="${commentsHref}" aria-label="View ${escapeHtml(commentCountText)}">` +
-        `<span class="comment-icon" aria-hidden="true">💬</span>` +
-        `<span class="comment-label">Comments</span>` +
-        `<span class="${commentCountClass}" aria-hidden="true">${escapeHtml(String(commentCount))}</span>` +
-        `</a>`;
-      const deleteBtn = `<button type="button" class="btn small danger" data-action="delete-item" data-item-id="${escapeHtml(it.id)}">Delete</button>`;
-      cells.push(`<td style="width:1%;white-space:nowrap;">` +
-        `<a class="btn small" href="${viewHref}">View</a> ` +
-        `${commentsBtn} ` +
-        `${deleteBtn}` +
-        `</td>`);
-      return `<tr>${cells.join('')}</tr>`;
-    }).join('');
+      // The server sorts (on the field's sortable index where there is one);
+      // start again from its first page in the new order.
+      if (tableScroller) tableScroller.scrollTop = 0;
+      loadItems();
+      return;
+    }
 
-    itemsTableContainer.innerHTML = `<div class="table-wrapper"><table><thead><tr>${headerCells}<th></th></tr></thead><tbody>${rowsHtml}</tbody></table></div>`;
-    const headerButtons = itemsTableContainer.querySelectorAll('.sort-toggle');
-    headerButtons.forEach(btn => {
-      btn.addEventListener('click', () => {
-        const key = btn.getAttribute('data-key');
-        if (!key) return;
-        if (sortState.key === key) {
-          sortState = { key, direction: sortState.direction === 'asc' ? 'desc' : 'asc' };
-        } else {
-          sortState = { key, direction: key === 'created_at' ? 'desc' : 'asc' };
-        }
-        renderItemsTable(itemSearch ? itemSearch.value : '');
-      });
-    });
+    const btn = e.target.closest('button[data-action="delete-item"]');
+    if (!btn) return;
+    const itemId = btn.getAttribute('data-item-id');
+    if (!itemId) return;
+    const matchedItem = findItems(itemId)[0];
+    const itemName = matchedItem?.name?.trim() || '';
+    const labelSource = (labels.items_label || 'Items').trim();
+    const singularLabel = labelSource.toLowerCase().endsWith('s') && labelSource.length > 1
+      ? labelSource.slice(0, -1)
+      : labelSource;
+    const fallbackTarget = `this ${singularLabel.toLowerCase() || 'item'}`;
+    const promptTarget = itemName ? `"${itemName}"` : fallbackTarget;
+    const shouldDelete = confirm(`Delete ${promptTarget}? This cannot be undone.`);
+    if (!shouldDelete) {
+      return;
+    }
+    const previousText = btn.textContent;
+    btn.disabled = true;
+    btn.textContent = 'Deleting…';
+    try {
+      await api(`/api/accounts/${accountId}/items/${encodeURIComponent(itemId)}`, { method: 'DELETE' });
+      invalidate(itemsBaseUrl);
+      itemsData = itemsData.filter(item => item.id !== itemId);
+      if (searchResults) searchResults.items = searchResults.items.filter(item => item.id !== itemId);
+      renderItemsTable(currentTerm());
+    } catch (err) {
+      alert(err.message || 'Failed to delete item');
+      btn.disabled = false;
+      btn.textContent = previousText;
+    }
+  });
 
-    const dropdowns = itemsTableContainer.querySelectorAll('[data-inline-dropdown]');
-    dropdowns.forEach(select => {
-      select.addEventListener('change', async () => {
-        const itemId = select.getAttribute('data-item-id');
-        const key = select.getAttribute('data-col-key');
-        const prev = select.getAttribute('data-prev') || '';
-        if (!itemId || !key) return;
-        const nextVal = select.value;
-        select.disabled = true;
-        try {
-          const item = itemsData.find(i => i.id === itemId);
-          if (!item) throw new Error('Item not found');
-          const updatedData = { ...(item.data || {}) };
-          updatedData[key] = nextVal;
-          const updated = await api(`/api/accounts/${accountId}/items/${encodeURIComponent(itemId)}`, {
-            method: 'PUT',
-            body: JSON.stringify({ name: item.name || '', data: updatedData }),
-          });
-          item.data = updated?.data || updatedData;
-          select.setAttribute('data-prev', nextVal);
-          renderItemsTable(itemSearch ? itemSearch.value : '');
-        } catch (err) {
-          select.value = prev;
-          alert(err.message || 'Failed to update value');
-        } finally {
-          select.disabled = false;
-        }
+  itemsTableContainer.addEventListener('change', async (e) => {
+    const select = e.target.closest('[data-inline-dropdown]');
+    if (!select) return;
+    const itemId = select.getAttribute('data-item-id');
+    const key = select.getAttribute('data-col-key');
+    const prev = select.getAttribute('data-prev') || '';
+    if (!itemId || !key) return;
+    const nextVal = select.value;
+    select.disabled = true;
+    try {
+      const matches = findItems(itemId);
+      const item = matches[0];
+      if (!item) throw new Error('Item not found');
+      const updatedData = { ...(item.data || {}) };
+      updatedData[key] = nextVal;
+      const updated = await api(`/api/accounts/${accountId}/items/${encodeURIComponent(itemId)}`, {
+        method: 'PUT',
+        body: JSON.stringify({ name: item.name || '', data: updatedData }),
       });
-    });
+      invalidate(itemsBaseUrl);
+      matches.forEach(m => { m.data = updated?.data || updatedData; });
+      select.setAttribute('data-prev', nextVal);
+      renderItemsTable(currentTerm());
+    } catch (err) {
+      select.value = prev;
+      alert(err.message || 'Failed to update value');
+    } finally {
+      select.disabled = false;
+    }
+  });
 
-    const deleteButtons = itemsTableContainer.querySelectorAll('button[data-action="delete-item"]');
-    deleteButtons.forEach(btn => {
-      btn.addEventListener('click', async () => {
-        const itemId = btn.getAttribute('data-item-id');
-        if (!itemId) return;
-        const matchedItem = itemsData.find(item => item.id === itemId);
-        const itemName = matchedItem?.name?.trim() || '';
-        const labelSource = (labels.items_label || 'Items').trim();
-        const singularLabel = labelSource.toLowerCase().endsWith('s') && labelSource.length > 1
-          ? labelSource.slice(0, -1)
-          : labelSource;
-        const fallbackTarget = `this ${singularLabel.toLowerCase() || 'item'}`;
-        const promptTarget = itemName ? `"${itemName}"` : fallbackTarget;
-        const shouldDelete = confirm(`Delete ${promptTarget}? This cannot be undone.`);
-        if (!shouldDelete) {
-          return;
-        }
-        const previousText = btn.textContent;
-        btn.disabled = true;
-        btn.textContent = 'Deleting…';
-        try {
-          await api(`/api/accounts/${accountId}/items/${encodeURIComponent(itemId)}`, { method: 'DELETE' });
-          itemsData = itemsData.filter(item => item.id !== itemId);
-          renderItemsTable(itemSearch ? itemSearch.value : '');
-        } catch (err) {
-          alert(err.message || 'Failed to delete item');
-          btn.disabled = false;
-          btn.textContent = previousText;
-        }
-      });
-    });
+  // The same item can be held both in the loaded pages and in search hits.
+  function findItems(itemId) {
+    const pool = searchResults ? itemsData.concat(searchResults.items) : itemsData;
+    return pool.filter(i => i.id === itemId);
   }
 
-  async function loadItems() {
+  function itemsUrl(cursor = null, { project = true } = {}) {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    const fields = project ? projectedFields() : null;
+    if (fields) params.set('fields', fields.join(','));
+    appendSortParams(params, sortState);
+    if (cursor) params.set('cursor', cursor);
+    return `${itemsBaseUrl}?${params}`;
+  }
+
+  async function fetchAllItems() {
+    const all = [];
+    let cursor = null;
+    do {
+      const page = await apiWithBackoff(itemsUrl(cursor, { project: false }));
+      all.push(...(page.items || []));
+      cursor = page.next || null;
+    } while (cursor);
+    return all;
+  }
+
+  async function runServerSearch(term, offset = 0) {
+    const params = new URLSearchParams({ q: term, section: slug, limit: String(PAGE_SIZE), offset: String(offset) });
+    const fields = projectedFields();
+    if (fields) params.set('fields', fields.join(','));
+    const request = ++listRequest;
+    loadingMore = true;
     try {
-      const page = await api(`/api/accounts/${accountId}/sections/${encodeURIComponent(slug)}/items?limit=200`);
-      itemsData = page.items || [];
-      setExportEnabled(itemsData.length > 0);
-      columnDefs = buildColumnDefs(itemsData);
-      const stored = loadColumnPrefs(accountId, slug);
-      const base = stored.length ? [...stored, ...columnDefs.map(c => c.key)] : columnDefs.map(c => c.key);
-      visibleColumns = reconcileVisibility(columnDefs, base);
-      const rawCount = loadColumnCount(accountId, slug);
-      const maxCount = visibleColumns.length;
-      if (Number.isFinite(rawCount) && rawCount > 0) {
-        columnCount = maxCount ? Math.min(rawCount, maxCount) : rawCount;
-      } else {
-        columnCount = null;
-      }
-      const visibleSet = new Set(visibleColumns);
-      if (!visibleSet.has(sortState.key)) {
-        const fallbackKey = visibleColumns[0] || 'created_at';
-        sortState = { key: fallbackKey, direction: fallbackKey === 'created_at' ? 'desc' : 'asc' };
-      }
+      const page = await latest(LIST_CHANNEL, `/api/accounts/${accountId}/search?${params}`);
+      // The box was cleared or changed while this was in flight.
+      if (currentTerm().trim() !== term) return;
+      const previous = offset && searchResults?.term === term ? searchResults.items : [];
+      searchResults = { term, items: previous.concat(page.items || []), next: page.next ?? null };
+    } catch (err) {
+      if (isAbortError(err)) return;
+      // Fall back to filtering whatever is already loaded.
+      console.error('Search failed:', err);
+      searchResults = null;
+    } finally {
+      if (request === listRequest) loadingMore = false;
+    }
+    renderItemsTable(currentTerm());
+  }
 
-      if (!itemsData.length) {
-        itemsEmptyState.classList.remove('hidden');
-        itemsTableContainer.innerHTML = '';
-        return;
-      }
-      itemsEmptyState.classList.add('hidden');
-      renderItemsTable(itemSearch ? itemSearch.value : '');
+  function onSearchInput(value) {
+    const term = value.trim();
+    clearTimeout(searchTimer);
+    if (tableScroller) tableScroller.scrollTop = 0;
+    if (!term || !nextCursor) {
+      // Everything is loaded (or nothing to search): filter locally and instantly.
+      searchResults = null;
+      renderItemsTable(value);
+      return;
+    }
+    searchTimer = setTimeout(() => runServerSearch(term), SEARCH_DEBOUNCE_MS);
+  }
+
+  async function loadNextPage() {
+    if (searchResults) {
+      if (searchResults.next !== null && !loadingMore) runServerSearch(searchResults.term, searchResults.next);
+      return;
+    }
+    if (!nextCursor || loadingMore) return;
+    const request = ++listRequest;
+    loadingMore = true;
+    const version = listVersion;
+    try {
+      const page = await latest(LIST_CHANNEL, itemsUrl(nextCursor), {}, apiWithBackoff);
+      // A sort change restarted the list while this page was in flight.
+      if (version !== listVersion) return;
+      itemsData = itemsData.concat(page.items || []);
+      nextCursor = page.next || null;
+    } catch (err) {
+      // Superseded by a search; the page is fetched again on the next scroll.
+      if (isAbortError(err)) return;
+      console.error('Failed to load more items:', err);
+      if (version === listVersion) nextCursor = null;
+    } finally {
+      if (request === listRequest) loadingMore = false;
+    }
+    renderItemsTable(currentTerm());
+  }
+
+  function applyFirstPage(page) {
+    listVersion += 1;
+    itemsData = page.items || [];
+    nextCursor = page.next || null;
+    setExportEnabled(itemsData.length > 0);
+    columnDefs = buildColumnDefs(itemsData);
+    const stored = loadColumnPrefs(accountId, slug);
+    const base = stored.length ? [...stored, ...columnDefs.map(c => c.key)] : columnDefs.map(c => c.key);
+    visibleColumns = reconcileVisibility(columnDefs, base);
+    const rawCount = loadColumnCount(accountId, slug);
+    const maxCount = visibleColumns.length;
+    if (Number.isFinite(rawCount) && rawCount > 0) {
+      columnCount = maxCount ? Math.min(rawCount, maxCount) : rawCount;
+    } else {
+      columnCount = null;
+    }
+
+    if (!itemsData.length) {
+      itemsEmptyState.classList.remove('hidden');
+      itemsTableContainer.innerHTML = '';
+      return;
+    }
+    itemsEmptyState.classList.add('hidden');
+    renderItemsTable(currentTerm());
+  }
+
+  async function loadItems() {
+    const url = itemsUrl();
+    try {
+      const page = await cachedGet(url, {
+        persist: true,
+        maxAge: ITEMS_MAX_AGE_MS,
+        onUpdate: (fresh) => {
+          // Only swap in the revalidated first page while nothing beyond it is
+          // loaded and the sort has not changed since.
+          if (url === itemsUrl() && itemsData.length <= PAGE_SIZE) applyFirstPage(fresh);
+        },
+      });
+      if (url !== itemsUrl()) return;
+      applyFirstPage(page);
     } catch (e) {
       itemsTableContainer.innerHTML = `<p class="small">Failed to load items: ${e.message}</p>`;
       itemsEmptyState.classList.add('hidden');
@@ -1038,10 +1247,11 @@ function saveSortPref(accountId, slug, sortState) {
     }
 
     try {
-      await api(`/api/accounts/${accountId}/sections/${encodeURIComponent(slug)}/items`, {
+      await api(itemsBaseUrl, {
         method: 'POST',
         body: JSON.stringify({ name, data })
       });
+      invalidate(itemsBaseUrl);
       itemMsg.textContent = 'Item added.';
       closeItemModal();
       await loadItems();
@@ -1102,10 +1312,15 @@ function saveSortPref(accountId, slug, sortState) {
 
   if (itemSearch) {
     itemSearch.addEventListener('input', (e) => {
-      renderItemsTable(e.target.value);
+      onSearchInput(e.target.value);
     });
   }
 
-  await loadSectionMeta();
-  await loadItems();
+  applySectionMeta(boot.section);
+  if (boot.items) {
+    prime(itemsUrl(), boot.items, { persist: true });
+    applyFirstPage(boot.items);
+  } else {
+    await loadItems();
+  }
 })();
\ No newline at end of file
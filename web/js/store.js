@@ -0,0 +1,110 @@
+import { api } from './common.js';
+
+// Shared client data layer: stale-while-revalidate caching keyed by URL,
+// de-duplication of identical in-flight GETs and abort-on-supersede channels.
+
+const CACHE_PREFIX = 'apiCache:';
+const MAX_PERSIST_CHARS = 1000000;
+const DEFAULT_MAX_AGE_MS = 30000;
+
+const memory = new Map();
+const inflight = new Map();
+const channels = new Map();
+
+function readEntry(url, persist) {
+  if (memory.has(url)) return memory.get(url);
+  if (!persist) return null;
+  try {
+    const raw = sessionStorage.getItem(CACHE_PREFIX + url);
+    if (!raw) return null;
+    const entry = JSON.parse(raw);
+    memory.set(url, entry);
+    return entry;
+  } catch {
+    return null;
+  }
+}
+
+function writeEntry(url, data, persist) {
+  const entry = { data, fetchedAt: Date.now() };
+  memory.set(url, entry);
+  if (!persist) return;
+  try {
+    const raw = JSON.stringify(entry);
+    if (raw.length <= MAX_PERSIST_CHARS) sessionStorage.setItem(CACHE_PREFIX + url, raw);
+  } catch {
+    // storage full or unavailable; the in-memory copy is enough
+  }
+}
+
+function fetchShared(url, persist) {
+  if (inflight.has(url)) return inflight.get(url);
+  const promise = api(url)
+    .then(data => {
+      writeEntry(url, data, persist);
+      return data;
+    })
+    .finally(() => inflight.delete(url));
+  inflight.set(url, promise);
+  return promise;
+}
+
+/**
+ * GET `url` through the cache.
+ *
+ * Fresh entries resolve immediately. Stale entries also resolve immediately,
+ * and a background revalidation calls `onUpdate(data)` when newer data lands.
+ * Concurrent callers for the same URL share one request.
+ */
+export async function cachedGet(url, { maxAge = DEFAULT_MAX_AGE_MS, persist = false, onUpdate } = {}) {
+  const entry = readEntry(url, persist);
+  if (entry) {
+    if (Date.now() - entry.fetchedAt > maxAge) {
+      fetchShared(url, persist)
+        .then(data => { if (onUpdate) onUpdate(data); })
+        .catch(() => {});
+    }
+    return entry.data;
+  }
+  return fetchShared(url, persist);
+}
+
+/**
+ * Run an uncached request on a named channel. Starting a new request on the
+ * same channel aborts the previous one, so only the latest result is used.
+ * Superseded calls reject with an AbortError. `request` defaults to api().
+ */
+export function latest(channel, url, opts = {}, request = api) {
+  const previous = channels.get(channel);
+  if (previous) previous.abort();
+  const controller = new AbortController();
+  channels.set(channel, controller);
+  return request(url, Object.assign({}, opts, { signal: controller.signal }))
+    .finally(() => {
+      if (channels.get(channel) === controller) channels.delete(channel);
+    });
+}
+
+export function isAbortError(err) {
+  return err?.name === 'AbortError';
+}
+
+/** Seed the cache with data fetched some other way (e.g. the bootstrap call). */
+export function prime(url, data, { persist = false } = {}) {
+  writeEntry(url, data, persist);
+}
+
+/** Drop cached entries whose URL starts with `prefix` (call after writes). */
+export function invalidate(prefix) {
+  for (const url of Array.from(memory.keys())) {
+    if (url.startsWith(prefix)) memory.delete(url);
+  }
+  try {
+    for (let i = sessionStorage.length - 1; i >= 0; i--) {
+      const key = sessionStorage.key(i);
+      if (key && key.startsWith(CACHE_PREFIX + prefix)) sessionStorage.removeItem(key);
+    }
+  } catch {
+    // ignore
+  }
+}